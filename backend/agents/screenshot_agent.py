@@ -3,9 +3,10 @@ FIXED Screenshot Agent - Uses PIL ImageGrab (Actually Works!)
 This version uses Python's PIL library instead of PowerShell for reliable screenshots.
 """
 
+import itertools
 import os
 import platform
-from datetime import datetime
+import time
 from pathlib import Path
 from typing import Dict, Any, TypedDict, Optional
 from langchain.tools import BaseTool
@@ -23,6 +24,14 @@ except ImportError:
     print("[WARNING] PIL not installed. Screenshot will use fallback methods.")
     print("[FIX] Run: pip install pillow")
 
+# Per-process capture sequence: keeps filenames unique when several
+# screenshots land within the same second
+_capture_counter = itertools.count()
+
+def _screenshot_filename() -> str:
+    """Build a unique screenshot filename from epoch seconds and the capture sequence"""
+    return f"screenshot_{int(time.time())}_{next(_capture_counter):04d}.png"
+
 class ScreenshotState(TypedDict):
     """State for screenshot workflow"""
     user_input: str
@@ -56,8 +65,7 @@ class ScreenshotTool(BaseTool):
                 print(f"[SCREENSHOT] Using PIL ImageGrab")
                 try:
                     # Generate filename with timestamp
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    screenshot_path = screenshots_dir / f"screenshot_{timestamp}.png"
+                    screenshot_path = screenshots_dir / _screenshot_filename()
                     
                     print(f"[SCREENSHOT] Target path: {screenshot_path}")
                     
@@ -81,7 +89,6 @@ class ScreenshotTool(BaseTool):
                     print(f"[SCREENSHOT] Image saved to {screenshot_path}")
                     
                     # Force file system sync
-                    import time
                     time.sleep(0.1)
                     
                     # Verify file exists
@@ -110,8 +117,7 @@ class ScreenshotTool(BaseTool):
                     import subprocess
                     
                     # Generate filename with timestamp
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    screenshot_path = screenshots_dir / f"screenshot_{timestamp}.png"
+                    screenshot_path = screenshots_dir / _screenshot_filename()
                     
                     # Prepare path for PowerShell (escape backslashes)
                     ps_path = str(screenshot_path).replace("\\", "\\\\")
@@ -157,16 +163,14 @@ Write-Output "Success"
                 print(f"[SCREENSHOT] Using macOS screencapture")
                 import subprocess
                 # Generate filename with timestamp
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = screenshots_dir / f"screenshot_{timestamp}.png"
+                screenshot_path = screenshots_dir / _screenshot_filename()
                 subprocess.run(['screencapture', str(screenshot_path)], check=True)
                 
             else:  # Linux
                 print(f"[SCREENSHOT] Using Linux screenshot tools")
                 import subprocess
                 # Generate filename with timestamp
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = screenshots_dir / f"screenshot_{timestamp}.png"
+                screenshot_path = screenshots_dir / _screenshot_filename()
                 # Try various Linux tools
                 tools = [
                     (['scrot', str(screenshot_path)], 'scrot'),
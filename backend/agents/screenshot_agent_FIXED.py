@@ -3,9 +3,10 @@ FIXED Screenshot Agent - Uses PIL ImageGrab (Actually Works!)
 This version uses Python's PIL library instead of PowerShell for reliable screenshots.
 """
 
+import itertools
 import os
 import platform
-from datetime import datetime
+import time
 from pathlib import Path
 from typing import Dict, Any, TypedDict, Optional
 from langchain.tools import BaseTool
@@ -23,6 +24,14 @@ except ImportError:
     print("[WARNING] PIL not installed. Screenshot will use fallback methods.")
     print("[FIX] Run: pip install pillow")
 
+# Per-process capture sequence: keeps filenames unique when several
+# screenshots land within the same second
+_capture_counter = itertools.count()
+
+def _screenshot_filename() -> str:
+    """Build a unique screenshot filename from epoch seconds and the capture sequence"""
+    return f"screenshot_{int(time.time())}_{next(_capture_counter):04d}.png"
+
 class ScreenshotState(TypedDict):
     """State for screenshot workflow"""
     user_input: str
@@ -45,8 +54,7 @@ class ScreenshotTool(BaseTool):
             screenshots_dir.mkdir(parents=True, exist_ok=True)
             
             # Generate filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            screenshot_path = screenshots_dir / f"screenshot_{timestamp}.png"
+            screenshot_path = screenshots_dir / _screenshot_filename()
             
             system = platform.system()
             
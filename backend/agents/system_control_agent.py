@@ -3,46 +3,225 @@ FIXED System Control Agent - Actually Controls Windows Volume!
 This version uses Python libraries instead of unreliable subprocess commands.
 """
 
+import functools
+import logging
 import os
 import platform
+import re
+import select
+import shlex
+import signal
 import subprocess
-from datetime import datetime
-from typing import Dict, Any, Optional, TypedDict, ClassVar
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from ctypes import cast, POINTER
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Tuple, TypedDict, ClassVar
 from langchain.tools import BaseTool
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_groq import ChatGroq
 from langgraph.graph import StateGraph, END
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 from config import config
 
-# Try to import pycaw for Windows volume control
-try:
-    from ctypes import cast, POINTER
-    from comtypes import CLSCTX_ALL
-    from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-    PYCAW_AVAILABLE = True
-except ImportError:
-    PYCAW_AVAILABLE = False
-    print("[WARNING] pycaw not installed. Volume control will use fallback methods.")
-    print("[FIX] Run: pip install pycaw comtypes")
+logger = logging.getLogger(__name__)
 
-# Try to import psutil for battery info
-try:
-    import psutil
-    PSUTIL_AVAILABLE = True
-except ImportError:
-    PSUTIL_AVAILABLE = False
-    print("[WARNING] psutil not installed. Battery info will not be available.")
-    print("[FIX] Run: pip install psutil")
+# Optional platform libraries are imported on first use - comtypes walks COM
+# type libraries at import time, which is wasted startup for sessions that never
+# touch volume, battery or brightness. Each *_AVAILABLE flag stays None until
+# its _lazy_import_* helper has run.
+AudioUtilities = IAudioEndpointVolume = CLSCTX_ALL = COMError = None
+PYCAW_AVAILABLE: Optional[bool] = None
+
+psutil = None
+PSUTIL_AVAILABLE: Optional[bool] = None
+
+sbc = None
+SBC_AVAILABLE: Optional[bool] = None
+
+def _lazy_import_pycaw() -> bool:
+    """Import pycaw/comtypes for Windows volume control on first use"""
+    global AudioUtilities, IAudioEndpointVolume, CLSCTX_ALL, COMError, PYCAW_AVAILABLE
+    if PYCAW_AVAILABLE is None:
+        try:
+            from comtypes import CLSCTX_ALL, COMError
+            from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+            PYCAW_AVAILABLE = True
+        except ImportError:
+            PYCAW_AVAILABLE = False
+            print("[WARNING] pycaw not installed. Volume control will use fallback methods.")
+            print("[FIX] Run: pip install pycaw comtypes")
+    return PYCAW_AVAILABLE
+
+def _lazy_import_psutil() -> bool:
+    """Import psutil for battery info on first use"""
+    global psutil, PSUTIL_AVAILABLE
+    if PSUTIL_AVAILABLE is None:
+        try:
+            import psutil
+            PSUTIL_AVAILABLE = True
+        except ImportError:
+            PSUTIL_AVAILABLE = False
+            print("[WARNING] psutil not installed. Battery info will not be available.")
+            print("[FIX] Run: pip install psutil")
+    return PSUTIL_AVAILABLE
+
+def _lazy_import_sbc() -> bool:
+    """Import screen_brightness_control for brightness on first use"""
+    global sbc, SBC_AVAILABLE
+    if SBC_AVAILABLE is None:
+        try:
+            import screen_brightness_control as sbc
+            SBC_AVAILABLE = True
+        except ImportError:
+            SBC_AVAILABLE = False
+            print("[WARNING] screen-brightness-control not installed. Brightness control will not be available.")
+            print("[FIX] Run: pip install screen-brightness-control")
+    return SBC_AVAILABLE
 
-# Try to import screen_brightness_control for brightness
+# Optional: pyahocorasick gives a single linear pass over the command for the
+# phrase table; a precompiled regex alternation is used when it is missing
 try:
-    import screen_brightness_control as sbc
-    SBC_AVAILABLE = True
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
 except ImportError:
-    SBC_AVAILABLE = False
-    print("[WARNING] screen-brightness-control not installed. Brightness control will not be available.")
-    print("[FIX] Run: pip install screen-brightness-control")
+    AHOCORASICK_AVAILABLE = False
+
+def _is_word_char(ch: str) -> bool:
+    """Mirror regex \\b semantics for boundary checks on automaton hits"""
+    return ch.isalnum() or ch == "_"
+
+def _build_action_matcher(phrases):
+    """Compile the command phrases once into an Aho-Corasick automaton (or regex fallback)"""
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for phrase in phrases:
+            automaton.add_word(phrase, phrase)
+        automaton.make_automaton()
+        return automaton
+    
+    # Longest alternatives first; the lookahead reports overlapping hits at every position
+    alternation = "|".join(re.escape(phrase) for phrase in sorted(phrases, key=len, reverse=True))
+    return re.compile(rf"(?=\b({alternation})\b)")
+
+def _longest_match(matcher, text: str) -> Optional[str]:
+    """Return the longest whole-word phrase found in text, or None"""
+    best = None
+    if AHOCORASICK_AVAILABLE:
+        for end, phrase in matcher.iter(text):
+            start = end - len(phrase) + 1
+            # Whole phrases only (e.g. "lock" must not fire inside "clock")
+            if start > 0 and _is_word_char(text[start - 1]):
+                continue
+            if end + 1 < len(text) and _is_word_char(text[end + 1]):
+                continue
+            if best is None or len(phrase) > len(best):
+                best = phrase
+        return best
+    
+    for match in matcher.finditer(text):
+        phrase = match.group(1)
+        if best is None or len(phrase) > len(best):
+            best = phrase
+    return best
+
+# Map user input to actions - frozen, and compiled into a matcher once at import
+_ACTION_MAP = MappingProxyType({
+    # Volume controls
+    "increase volume": "volume_up",
+    "raise volume": "volume_up",
+    "turn up volume": "volume_up",
+    "make it louder": "volume_up",
+    "volume up": "volume_up",
+    "louder": "volume_up",
+    "up": "volume_up",
+    "decrease volume": "volume_down",
+    "lower volume": "volume_down",
+    "turn down volume": "volume_down",
+    "make it quieter": "volume_down",
+    "volume down": "volume_down",
+    "quieter": "volume_down",
+    "down": "volume_down",
+    "mute": "mute",
+    "unmute": "unmute",
+    "silence": "mute",
+    
+    # Brightness controls
+    "brightness up": "brightness_up",
+    "increase brightness": "brightness_up",
+    "brighter": "brightness_up",
+    "brightness down": "brightness_down",
+    "decrease brightness": "brightness_down",
+    "dimmer": "brightness_down",
+    "dim": "brightness_down",
+    
+    # System info
+    "battery": "battery",
+    "battery status": "battery",
+    "battery level": "battery",
+    "battery percentage": "battery",
+    "time": "time",
+    "what time": "time",
+    "current time": "time",
+    "what's the time": "time",
+    "tell me the time": "time",
+    
+    # Lock and power
+    "lock": "lock",
+    "lock screen": "lock",
+    "lock computer": "lock",
+    "shutdown": "shutdown",
+    "shut down": "shutdown",
+    "turn off": "shutdown",
+    "restart": "restart",
+    "reboot": "restart",
+    "sleep": "sleep",
+    "hibernate": "sleep"
+})
+
+_ACTION_AUTOMATON = _build_action_matcher(_ACTION_MAP)
+
+# Stripped from both ends of an utterance before the exact-phrase lookup
+_COMMAND_PUNCTUATION = " \t\n.!?,"
+
+# Resolved once - platform.system() probes the OS on every call
+_SYSTEM = platform.system()
+
+# Battery and brightness reads hit ACPI/WMI; reuse a reading for this long so
+# back-to-back voice commands don't re-query the hardware
+_SENSOR_TTL_SECONDS = 1.0
+
+# Formats for the "time" action
+_DATE_FMT = "%A, %B %d, %Y"
+_TIME_FMT = "%I:%M %p"
+_ISO_FMT = "%Y-%m-%dT%H:%M:%S"
+
+# Volume steps arriving within this window are folded into a single write
+_VOLUME_FLUSH_DELAY = 0.01
+
+# Longest an osascript/amixer command may run before its shell is killed
+_SHELL_COMMAND_TIMEOUT = 5.0
+
+# COM apartment bookkeeping - the cached audio endpoint outlives a single call,
+# so COM is initialized once per worker thread instead of per command
+_com_thread_state = threading.local()
+
+def _ensure_com_initialized() -> bool:
+    """Initialize COM (multithreaded apartment) once for the calling thread.
+    Returns True if the thread is stuck in a single-threaded apartment instead"""
+    if getattr(_com_thread_state, "initialized", False):
+        return _com_thread_state.sta
+    import comtypes
+    try:
+        comtypes.CoInitializeEx(comtypes.COINIT_MULTITHREADED)
+        _com_thread_state.sta = False
+    except OSError:
+        # RPC_E_CHANGED_MODE: the thread already joined an STA (comtypes does
+        # that to its importing thread). MTA interface pointers cannot be used
+        # here without marshalling
+        _com_thread_state.sta = True
+    _com_thread_state.initialized = True
+    return _com_thread_state.sta
 
 class SystemState(TypedDict):
     """State for the System Control agent workflow"""
@@ -57,19 +236,41 @@ class SystemControlTool(BaseTool):
     name: str = "system_control"
     description: str = "Control system settings and operations"
     
+    # Cached IAudioEndpointVolume pointer and device-change listener
+    _volume: Any = PrivateAttr(default=None)
+    _audio_session_cb: Any = PrivateAttr(default=None)
+    # Debounced volume write-back: target level awaiting flush and its timer
+    _pending_volume: Any = PrivateAttr(default=None)
+    _flush_handle: Any = PrivateAttr(default=None)
+    # Resolved by the next flush - every step folded into it waits on its outcome
+    _flush_done: Any = PrivateAttr(default=None)
+    _volume_lock: Any = PrivateAttr(default_factory=threading.Lock)
+    # Serializes activating the shared endpoint (warmup vs. first command)
+    _endpoint_lock: Any = PrivateAttr(default_factory=threading.Lock)
+    # Long-lived /bin/sh child that runs osascript/amixer commands fed over stdin
+    _shell: Any = PrivateAttr(default=None)
+    _shell_lock: Any = PrivateAttr(default_factory=threading.Lock)
+    # Volume handler for this platform, bound once at construction
+    _volume_impl: Any = PrivateAttr(default=None)
+    # (monotonic timestamp, reading) pairs for the TTL-cached sensor reads
+    _battery_cache: Any = PrivateAttr(default=None)
+    _brightness_cache: Any = PrivateAttr(default=None)
+    # (epoch second, result) for the last "time" lookup
+    _time_cache: Any = PrivateAttr(default=None)
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._volume_impl = {
+            "Windows": self._windows_volume_control,
+            "Darwin": self._macos_volume_control
+        }.get(_SYSTEM, self._linux_volume_control)
+    
     def _run(self, action: str, value: str = None) -> Dict[str, Any]:
         """Execute system control action - ACTUALLY WORKS NOW!"""
         try:
-            system = platform.system()
-            
             # VOLUME CONTROL - FIXED for Windows
             if action in ["volume_up", "volume_down", "mute", "unmute"]:
-                if system == "Windows":
-                    return self._windows_volume_control(action)
-                elif system == "Darwin":
-                    return self._macos_volume_control(action)
-                else:
-                    return self._linux_volume_control(action)
+                return self._volume_impl(action)
             
             # BRIGHTNESS CONTROL
             elif action in ["brightness_up", "brightness_down", "set_brightness"]:
@@ -84,11 +285,11 @@ class SystemControlTool(BaseTool):
             
             # LOCK SCREEN
             elif action == "lock":
-                return self._lock_screen(system)
+                return self._lock_screen(_SYSTEM)
             
             # POWER OPERATIONS
             elif action in ["shutdown", "restart", "sleep"]:
-                return self._power_operation(system, action)
+                return self._power_operation(_SYSTEM, action)
             
             else:
                 return {
@@ -104,65 +305,79 @@ class SystemControlTool(BaseTool):
                 "error": str(e)
             }
     
+    def _get_volume_endpoint(self):
+        """Return the speaker volume endpoint, activating it through COM on first use"""
+        if _ensure_com_initialized():
+            # The shared endpoint lives in the MTA, so an STA thread gets its own
+            volume = getattr(_com_thread_state, "volume", None)
+            if volume is None:
+                volume = _com_thread_state.volume = self._activate_volume_endpoint()
+            return volume
+        with self._endpoint_lock:
+            if self._volume is None:
+                self._volume = self._activate_volume_endpoint()
+                self._watch_default_device()
+            return self._volume
+    
+    def _activate_volume_endpoint(self):
+        """Activate IAudioEndpointVolume on the default speakers for the calling thread"""
+        devices = AudioUtilities.GetSpeakers()
+        interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+        return cast(interface, POINTER(IAudioEndpointVolume))
+    
+    def _drop_volume_endpoint(self):
+        """Forget the calling thread's endpoint so the next use re-activates it"""
+        if getattr(_com_thread_state, "sta", False):
+            _com_thread_state.volume = None
+        else:
+            self._volume = None
+    
+    def _watch_default_device(self):
+        """Drop the cached endpoint when the default output device changes (e.g. headset plugged in).
+        Called with _endpoint_lock held, so the callback is registered once"""
+        if self._audio_session_cb is not None:
+            return
+        try:
+            from pycaw.callbacks import MMNotificationClient
+            tool = self
+            
+            class _DefaultDeviceCallback(MMNotificationClient):
+                def on_default_device_changed(self, flow, flow_id, role, role_id, default_device_id):
+                    tool._volume = None
+            
+            callback = _DefaultDeviceCallback()
+            AudioUtilities.GetDeviceEnumerator().RegisterEndpointNotificationCallback(callback)
+            self._audio_session_cb = callback
+        except Exception as e:
+            # Without notifications a stale endpoint is still recovered via COMError below
+            print(f"[SYSTEM_CONTROL] Audio device notifications unavailable: {e}")
+    
+    def warmup_jobs(self):
+        """Callables that prime COM, psutil and monitor enumeration ahead of the first command"""
+        return [self._warm_volume, self._warm_battery, self._warm_brightness]
+    
+    def _warm_volume(self):
+        if _SYSTEM == "Windows" and _lazy_import_pycaw():
+            self._get_volume_endpoint()
+    
+    def _warm_battery(self):
+        if _lazy_import_psutil():
+            self._read_battery()
+    
+    def _warm_brightness(self):
+        if _lazy_import_sbc():
+            sbc.list_monitors()
+    
     def _windows_volume_control(self, action: str) -> Dict[str, Any]:
-        """Windows volume control - FIXED VERSION with COM initialization"""
+        """Windows volume control - reuses the cached pycaw endpoint"""
         try:
-            if PYCAW_AVAILABLE:
-                # Initialize COM for this thread
-                import comtypes
-                comtypes.CoInitialize()
-                
+            if _lazy_import_pycaw():
                 try:
-                    # Use pycaw - ACTUALLY WORKS!
-                    devices = AudioUtilities.GetSpeakers()
-                    interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-                    volume = cast(interface, POINTER(IAudioEndpointVolume))
-                    
-                    if action == "volume_up":
-                        current = volume.GetMasterVolumeLevelScalar()
-                        new_volume = min(1.0, current + 0.1)  # +10%
-                        volume.SetMasterVolumeLevelScalar(new_volume, None)
-                        percent = int(new_volume * 100)
-                        return {
-                            "success": True,
-                            "message": f"✅ Volume increased to {percent}%",
-                            "action": action,
-                            "method": "pycaw"
-                        }
-                    
-                    elif action == "volume_down":
-                        current = volume.GetMasterVolumeLevelScalar()
-                        new_volume = max(0.0, current - 0.1)  # -10%
-                        volume.SetMasterVolumeLevelScalar(new_volume, None)
-                        percent = int(new_volume * 100)
-                        return {
-                            "success": True,
-                            "message": f"✅ Volume decreased to {percent}%",
-                            "action": action,
-                            "method": "pycaw"
-                        }
-                    
-                    elif action == "mute":
-                        volume.SetMute(1, None)
-                        return {
-                            "success": True,
-                            "message": "✅ System muted",
-                            "action": action,
-                            "method": "pycaw"
-                        }
-                    
-                    elif action == "unmute":
-                        volume.SetMute(0, None)
-                        return {
-                            "success": True,
-                            "message": "✅ System unmuted",
-                            "action": action,
-                            "method": "pycaw"
-                        }
-                
-                finally:
-                    # Cleanup COM
-                    comtypes.CoUninitialize()
+                    return self._pycaw_volume_action(self._get_volume_endpoint(), action)
+                except COMError:
+                    # Cached endpoint went stale (device removed) - re-activate once
+                    self._drop_volume_endpoint()
+                    return self._pycaw_volume_action(self._get_volume_endpoint(), action)
             
             else:
                 # Fallback: Try nircmd if available
@@ -198,17 +413,146 @@ class SystemControlTool(BaseTool):
                 "error": str(e)
             }
     
+    def _queue_volume_change(self, volume, delta: float) -> Tuple[float, Future]:
+        """Fold a volume step into the pending write and arm the flush timer.
+        Returns the new level and a future resolved once it is written"""
+        with self._volume_lock:
+            if self._pending_volume is None:
+                base = volume.GetMasterVolumeLevelScalar()
+            else:
+                base = self._pending_volume
+            self._pending_volume = max(0.0, min(1.0, base + delta))
+            
+            if self._flush_handle is None:
+                self._flush_done = Future()
+                self._flush_handle = threading.Timer(_VOLUME_FLUSH_DELAY, self.flush)
+                self._flush_handle.daemon = True
+                self._flush_handle.start()
+            return self._pending_volume, self._flush_done
+    
+    def flush(self) -> Optional[bool]:
+        """Write any pending volume level to the endpoint in one call.
+        Returns whether the write succeeded, or None if nothing was pending"""
+        with self._volume_lock:
+            handle, self._flush_handle = self._flush_handle, None
+            done, self._flush_done = self._flush_done, None
+            if handle is not None:
+                handle.cancel()
+            if self._pending_volume is None:
+                return None
+            # Written under the lock with the target still pending, so a step
+            # arriving meanwhile waits and then builds on the level written here
+            try:
+                self._get_volume_endpoint().SetMasterVolumeLevelScalar(self._pending_volume, None)
+            except Exception as e:
+                self._drop_volume_endpoint()
+                logger.warning("Volume write-back failed: %s", e)
+                if done is not None:
+                    done.set_exception(e)
+                return False
+            else:
+                if done is not None:
+                    done.set_result(True)
+                return True
+            finally:
+                self._pending_volume = None
+    
+    def _pycaw_volume_action(self, volume, action: str) -> Dict[str, Any]:
+        """Apply a volume action to an IAudioEndpointVolume interface"""
+        if action == "volume_up":
+            new_volume, written = self._queue_volume_change(volume, 0.1)  # +10%
+            # Report only once the folded write has landed; a failed write
+            # raises here (COMError re-activates the endpoint and retries)
+            written.result()
+            percent = int(new_volume * 100)
+            return {
+                "success": True,
+                "message": f"✅ Volume increased to {percent}%",
+                "action": action,
+                "method": "pycaw"
+            }
+        
+        elif action == "volume_down":
+            new_volume, written = self._queue_volume_change(volume, -0.1)  # -10%
+            written.result()
+            percent = int(new_volume * 100)
+            return {
+                "success": True,
+                "message": f"✅ Volume decreased to {percent}%",
+                "action": action,
+                "method": "pycaw"
+            }
+        
+        elif action == "mute":
+            volume.SetMute(1, None)
+            return {
+                "success": True,
+                "message": "✅ System muted",
+                "action": action,
+                "method": "pycaw"
+            }
+        
+        elif action == "unmute":
+            volume.SetMute(0, None)
+            return {
+                "success": True,
+                "message": "✅ System unmuted",
+                "action": action,
+                "method": "pycaw"
+            }
+    
+    def _kill_shell(self):
+        """Kill the shell child and anything it started (caller holds _shell_lock)"""
+        if self._shell is not None:
+            try:
+                os.killpg(self._shell.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            self._shell.wait()
+            self._shell = None
+    
+    def _run_in_shell(self, argv):
+        """Run argv in the persistent shell child, raising CalledProcessError on failure"""
+        with self._shell_lock:
+            if self._shell is None or self._shell.poll() is not None:
+                self._shell = subprocess.Popen(
+                    ["/bin/sh", "-s"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    bufsize=1,
+                    # Own process group, so a hung command dies with the shell
+                    start_new_session=True
+                )
+            
+            # Only the exit status comes back on stdout, one line per command.
+            # stdin is /dev/null so a command cannot swallow later script lines
+            self._shell.stdin.write(f"{shlex.join(argv)} </dev/null >/dev/null 2>&1; echo $?\n")
+            self._shell.stdin.flush()
+            ready, _, _ = select.select([self._shell.stdout], [], [], _SHELL_COMMAND_TIMEOUT)
+            status = self._shell.stdout.readline().strip() if ready else ""
+            
+            if not status.isdigit():
+                # Hung or dead - kill it so the next command gets a fresh shell
+                self._kill_shell()
+                if not ready:
+                    raise subprocess.TimeoutExpired(argv, _SHELL_COMMAND_TIMEOUT)
+                raise subprocess.CalledProcessError(-1, argv)
+        if status != "0":
+            raise subprocess.CalledProcessError(int(status), argv)
+    
     def _macos_volume_control(self, action: str) -> Dict[str, Any]:
         """macOS volume control"""
         try:
             commands = {
-                "volume_up": "osascript -e 'set volume output volume (output volume of (get volume settings) + 10)'",
-                "volume_down": "osascript -e 'set volume output volume (output volume of (get volume settings) - 10)'",
-                "mute": "osascript -e 'set volume output muted true'",
-                "unmute": "osascript -e 'set volume output muted false'"
+                "volume_up": ["osascript", "-e", "set volume output volume (output volume of (get volume settings) + 10)"],
+                "volume_down": ["osascript", "-e", "set volume output volume (output volume of (get volume settings) - 10)"],
+                "mute": ["osascript", "-e", "set volume output muted true"],
+                "unmute": ["osascript", "-e", "set volume output muted false"]
             }
             
-            subprocess.run(commands[action], shell=True, check=True)
+            self._run_in_shell(commands[action])
             return {
                 "success": True,
                 "message": f"✅ {action.replace('_', ' ').title()} executed",
@@ -225,13 +569,13 @@ class SystemControlTool(BaseTool):
         """Linux volume control"""
         try:
             commands = {
-                "volume_up": "amixer -D pulse sset Master 10%+",
-                "volume_down": "amixer -D pulse sset Master 10%-",
-                "mute": "amixer -D pulse sset Master mute",
-                "unmute": "amixer -D pulse sset Master unmute"
+                "volume_up": ["amixer", "-D", "pulse", "sset", "Master", "10%+"],
+                "volume_down": ["amixer", "-D", "pulse", "sset", "Master", "10%-"],
+                "mute": ["amixer", "-D", "pulse", "sset", "Master", "mute"],
+                "unmute": ["amixer", "-D", "pulse", "sset", "Master", "unmute"]
             }
             
-            subprocess.run(commands[action], shell=True, check=True)
+            self._run_in_shell(commands[action])
             return {
                 "success": True,
                 "message": f"✅ {action.replace('_', ' ').title()} executed",
@@ -247,13 +591,18 @@ class SystemControlTool(BaseTool):
     def _lock_screen(self, system: str) -> Dict[str, Any]:
         """Lock screen - cross-platform"""
         try:
-            commands = {
-                "Windows": "rundll32.exe user32.dll,LockWorkStation",
-                "Darwin": "pmset displaysleepnow",
-                "Linux": "xdg-screensaver lock"
-            }
+            if system == "Windows":
+                # Call user32 directly instead of spawning a shell and rundll32
+                import ctypes
+                if not ctypes.windll.user32.LockWorkStation():
+                    raise ctypes.WinError()
+            else:
+                commands = {
+                    "Darwin": ["pmset", "displaysleepnow"],
+                    "Linux": ["xdg-screensaver", "lock"]
+                }
+                subprocess.Popen(commands[system])
             
-            subprocess.Popen(commands[system], shell=True)
             return {
                 "success": True,
                 "message": "✅ Screen locked",
@@ -271,23 +620,23 @@ class SystemControlTool(BaseTool):
         try:
             commands = {
                 "Windows": {
-                    "shutdown": "shutdown /s /t 10",
-                    "restart": "shutdown /r /t 10",
-                    "sleep": "rundll32.exe powrprof.dll,SetSuspendState 0,1,0"
+                    "shutdown": ["shutdown", "/s", "/t", "10"],
+                    "restart": ["shutdown", "/r", "/t", "10"],
+                    "sleep": ["rundll32.exe", "powrprof.dll,SetSuspendState", "0,1,0"]
                 },
                 "Darwin": {
-                    "shutdown": "shutdown -h +1",
-                    "restart": "shutdown -r +1",
-                    "sleep": "pmset sleepnow"
+                    "shutdown": ["shutdown", "-h", "+1"],
+                    "restart": ["shutdown", "-r", "+1"],
+                    "sleep": ["pmset", "sleepnow"]
                 },
                 "Linux": {
-                    "shutdown": "shutdown -h +1",
-                    "restart": "shutdown -r +1",
-                    "sleep": "systemctl suspend"
+                    "shutdown": ["shutdown", "-h", "+1"],
+                    "restart": ["shutdown", "-r", "+1"],
+                    "sleep": ["systemctl", "suspend"]
                 }
             }
             
-            subprocess.Popen(commands[system][action], shell=True)
+            subprocess.Popen(commands[system][action])
             
             messages = {
                 "shutdown": "✅ Shutdown initiated (10 seconds)",
@@ -307,10 +656,33 @@ class SystemControlTool(BaseTool):
                 "error": str(e)
             }
     
+    def _read_brightness(self) -> int:
+        """Current brightness of the first monitor, cached for _SENSOR_TTL_SECONDS"""
+        now = time.monotonic()
+        if self._brightness_cache and now - self._brightness_cache[0] < _SENSOR_TTL_SECONDS:
+            return self._brightness_cache[1]
+        brightness = sbc.get_brightness()[0]  # Get first monitor
+        self._brightness_cache = (now, brightness)
+        return brightness
+    
+    def _write_brightness(self, brightness: int):
+        """Set brightness and drop the cached reading"""
+        sbc.set_brightness(brightness)
+        self._brightness_cache = None
+    
+    def _read_battery(self):
+        """psutil.sensors_battery(), cached for _SENSOR_TTL_SECONDS"""
+        now = time.monotonic()
+        if self._battery_cache and now - self._battery_cache[0] < _SENSOR_TTL_SECONDS:
+            return self._battery_cache[1]
+        battery = psutil.sensors_battery()
+        self._battery_cache = (now, battery)
+        return battery
+    
     def _brightness_control(self, action: str, value: str = None) -> Dict[str, Any]:
         """Control screen brightness"""
         try:
-            if not SBC_AVAILABLE:
+            if not _lazy_import_sbc():
                 return {
                     "success": False,
                     "message": "❌ Brightness control not available",
@@ -319,9 +691,9 @@ class SystemControlTool(BaseTool):
                 }
             
             if action == "brightness_up":
-                current = sbc.get_brightness()[0]  # Get first monitor
+                current = self._read_brightness()
                 new_brightness = min(100, current + 10)
-                sbc.set_brightness(new_brightness)
+                self._write_brightness(new_brightness)
                 return {
                     "success": True,
                     "message": f"✅ Brightness increased to {new_brightness}%",
@@ -330,9 +702,9 @@ class SystemControlTool(BaseTool):
                 }
             
             elif action == "brightness_down":
-                current = sbc.get_brightness()[0]
+                current = self._read_brightness()
                 new_brightness = max(0, current - 10)
-                sbc.set_brightness(new_brightness)
+                self._write_brightness(new_brightness)
                 return {
                     "success": True,
                     "message": f"✅ Brightness decreased to {new_brightness}%",
@@ -343,7 +715,7 @@ class SystemControlTool(BaseTool):
             elif action == "set_brightness" and value:
                 brightness_value = int(value)
                 brightness_value = max(0, min(100, brightness_value))  # Clamp 0-100
-                sbc.set_brightness(brightness_value)
+                self._write_brightness(brightness_value)
                 return {
                     "success": True,
                     "message": f"✅ Brightness set to {brightness_value}%",
@@ -368,7 +740,7 @@ class SystemControlTool(BaseTool):
     def _get_battery_info(self) -> Dict[str, Any]:
         """Get battery information"""
         try:
-            if not PSUTIL_AVAILABLE:
+            if not _lazy_import_psutil():
                 return {
                     "success": False,
                     "message": "❌ Battery info not available",
@@ -376,7 +748,7 @@ class SystemControlTool(BaseTool):
                     "suggestion": "Install: pip install psutil"
                 }
             
-            battery = psutil.sensors_battery()
+            battery = self._read_battery()
             
             if battery is None:
                 return {
@@ -421,22 +793,29 @@ class SystemControlTool(BaseTool):
     def _get_current_time(self) -> Dict[str, Any]:
         """Get current date and time"""
         try:
-            now = datetime.now()
+            # The result only changes once a second, so reuse it within the same second
+            sec = int(time.time())
+            if self._time_cache and self._time_cache[0] == sec:
+                return dict(self._time_cache[1])
+            
+            now = time.localtime(sec)
             
             # Format date and time
-            date_str = now.strftime("%A, %B %d, %Y")  # Monday, January 01, 2024
-            time_str = now.strftime("%I:%M %p")  # 02:30 PM
+            date_str = time.strftime(_DATE_FMT, now)  # Monday, January 01, 2024
+            time_str = time.strftime(_TIME_FMT, now)  # 02:30 PM
             
             message = f"🕒 Current time: {time_str}\n📅 Date: {date_str}"
             
-            return {
+            result = {
                 "success": True,
                 "message": message,
                 "action": "time",
                 "time": time_str,
                 "date": date_str,
-                "timestamp": now.isoformat()
+                "timestamp": time.strftime(_ISO_FMT, now)
             }
+            self._time_cache = (sec, result)
+            return dict(result)
         
         except Exception as e:
             return {
@@ -445,154 +824,161 @@ class SystemControlTool(BaseTool):
                 "error": str(e)
             }
 
+# Shared by every agent instance and by the module-level workflow nodes
+_SYSTEM_TOOL = SystemControlTool()
+
+def _match_phrase(user_input: str) -> Optional[str]:
+    """Find the command phrase in lowercased user input"""
+    # Bare commands ("mute", "lock screen") are the common case: one hash lookup
+    matched_phrase = user_input.strip(_COMMAND_PUNCTUATION)
+    if matched_phrase not in _ACTION_MAP:
+        # Longest matching phrase wins, so "shut down" beats "down"
+        # and "brightness up" beats "up"
+        matched_phrase = _longest_match(_ACTION_AUTOMATON, user_input)
+    if matched_phrase:
+        print(f"[SYSTEM_CONTROL] Matched phrase: '{matched_phrase}' -> action: '{_ACTION_MAP[matched_phrase]}'")
+    return matched_phrase
+
+def _detect_action(user_input: str) -> Optional[str]:
+    """Map lowercased user input to a system action"""
+    matched_phrase = _match_phrase(user_input)
+    return _ACTION_MAP[matched_phrase] if matched_phrase else None
+
+def _format_result(result: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """Turn a tool result into (response_message, error)"""
+    print(f"[SYSTEM_CONTROL] Result: {result}")
+    
+    response_message = result['message']
+    if result['success']:
+        if result.get('method'):
+            response_message += f"\n🔧 Method: {result['method']}"
+        return response_message, None
+    
+    if result.get('suggestion'):
+        response_message += f"\n💡 {result['suggestion']}"
+    return response_message, result.get('error')
+
+def _execute_action(action: str, value: Optional[str]) -> Tuple[str, Optional[str]]:
+    """Run the action through the shared tool and return (response_message, error)"""
+    print(f"[SYSTEM_CONTROL] Executing action: {action} (value: {value})")
+    return _format_result(_SYSTEM_TOOL._run(action, value))
+
+def _build_workflow() -> StateGraph:
+    """Build LangGraph workflow - the graph is static, so it is compiled once at import"""
+    
+    def parse_command_node(state: SystemState) -> SystemState:
+        """Parse system control command"""
+        try:
+            user_input = state['user_input'].lower()
+            print(f"\n[SYSTEM_CONTROL] Parsing command: '{user_input}'")
+            
+            detected_action = _detect_action(user_input)
+            
+            if detected_action:
+                state['action_type'] = detected_action
+                state['action_value'] = None
+                state['error'] = None
+                print(f"[SYSTEM_CONTROL] Detected action: {detected_action}")
+            else:
+                state['error'] = "Could not identify system action"
+                print(f"[SYSTEM_CONTROL] No action detected for: '{user_input}'")
+            
+        except Exception as e:
+            state['error'] = f"Failed to parse command: {str(e)}"
+        
+        return state
+    
+    def execute_action_node(state: SystemState) -> SystemState:
+        """Execute the system action"""
+        try:
+            if state.get('error'):
+                print(f"[SYSTEM_CONTROL] Skipping execution due to error: {state['error']}")
+                return state
+            
+            state['response_message'], error = _execute_action(
+                state.get('action_type'), state.get('action_value')
+            )
+            if error:
+                state['error'] = error
+            
+        except Exception as e:
+            state['error'] = str(e)
+            state['response_message'] = f"❌ Failed to execute system action"
+        
+        return state
+    
+    # Build workflow
+    workflow = StateGraph(SystemState)
+    workflow.add_node("parse_command", parse_command_node)
+    workflow.add_node("execute_action", execute_action_node)
+    
+    workflow.set_entry_point("parse_command")
+    workflow.add_edge("parse_command", "execute_action")
+    workflow.add_edge("execute_action", END)
+    
+    return workflow.compile()
+
+_COMPILED_WORKFLOW = _build_workflow()
+
+def _log_warmup_failure(future):
+    """Report a warmup job's exception instead of dropping it with the future"""
+    error = future.exception()
+    if error is not None:
+        logger.warning("System control warmup failed: %s", error)
+
 class SystemControlAgent:
     """System Control Agent with LangGraph workflow"""
     
     def __init__(self):
-        self.llm = ChatGroq(
+        self.system_tool = _SYSTEM_TOOL
+        self.workflow = _COMPILED_WORKFLOW
+        
+        # Warm up the platform backends in parallel without blocking startup.
+        # A command arriving first simply does the work itself - endpoint
+        # activation is locked - so nothing waits on these; failures are logged
+        warmup_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="system-control-warmup")
+        for job in self.system_tool.warmup_jobs():
+            warmup_pool.submit(job).add_done_callback(_log_warmup_failure)
+        warmup_pool.shutdown(wait=False)
+        
+        # Every known phrase resolves to exactly one tool call, so compile the
+        # phrase table into pre-bound calls once instead of interpreting it per command
+        self._compiled = {
+            phrase: functools.partial(self.system_tool._run, action)
+            for phrase, action in _ACTION_MAP.items()
+        }
+    
+    @functools.cached_property
+    def llm(self):
+        """Groq client, built on first access - no current code path needs it"""
+        from langchain_groq import ChatGroq
+        return ChatGroq(
             groq_api_key=config.GROQ_API_KEY,
             model_name=config.GROQ_MODEL,
             temperature=config.AGENT_TEMPERATURE,
             max_tokens=config.MAX_RESPONSE_TOKENS
         )
-        
-        self.system_tool = SystemControlTool()
-        self.workflow = self._build_workflow()
-    
-    def _build_workflow(self) -> StateGraph:
-        """Build LangGraph workflow"""
-        
-        def parse_command_node(state: SystemState) -> SystemState:
-            """Parse system control command"""
-            try:
-                user_input = state['user_input'].lower()
-                print(f"\n[SYSTEM_CONTROL] Parsing command: '{user_input}'")
-                
-                # Map user input to actions (order matters - check specific phrases first)
-                action_mapping = {
-                    # Volume controls (check specific phrases first)
-                    "increase volume": "volume_up",
-                    "raise volume": "volume_up",
-                    "turn up volume": "volume_up",
-                    "make it louder": "volume_up",
-                    "volume up": "volume_up",
-                    "louder": "volume_up",
-                    "up": "volume_up",
-                    "decrease volume": "volume_down",
-                    "lower volume": "volume_down",
-                    "turn down volume": "volume_down",
-                    "make it quieter": "volume_down",
-                    "volume down": "volume_down",
-                    "quieter": "volume_down",
-                    "down": "volume_down",
-                    "mute": "mute",
-                    "unmute": "unmute",
-                    "silence": "mute",
-                    
-                    # Brightness controls
-                    "brightness up": "brightness_up",
-                    "increase brightness": "brightness_up",
-                    "brighter": "brightness_up",
-                    "brightness down": "brightness_down",
-                    "decrease brightness": "brightness_down",
-                    "dimmer": "brightness_down",
-                    "dim": "brightness_down",
-                    
-                    # System info
-                    "battery": "battery",
-                    "battery status": "battery",
-                    "battery level": "battery",
-                    "battery percentage": "battery",
-                    "time": "time",
-                    "what time": "time",
-                    "current time": "time",
-                    "what's the time": "time",
-                    "tell me the time": "time",
-                    
-                    # Lock and power
-                    "lock": "lock",
-                    "lock screen": "lock",
-                    "lock computer": "lock",
-                    "shutdown": "shutdown",
-                    "shut down": "shutdown",
-                    "turn off": "shutdown",
-                    "restart": "restart",
-                    "reboot": "restart",
-                    "sleep": "sleep",
-                    "hibernate": "sleep"
-                }
-                
-                # Find matching action - use word boundaries to avoid partial matches (e.g., "lock" in "clock")
-                import re
-                detected_action = None
-                for phrase, action in action_mapping.items():
-                    # Use word boundaries to match whole phrases only
-                    pattern = r'\b' + re.escape(phrase) + r'\b'
-                    if re.search(pattern, user_input):
-                        detected_action = action
-                        print(f"[SYSTEM_CONTROL] Matched phrase: '{phrase}' -> action: '{action}'")
-                        break
-                
-                if detected_action:
-                    state['action_type'] = detected_action
-                    state['action_value'] = None
-                    state['error'] = None
-                    print(f"[SYSTEM_CONTROL] Detected action: {detected_action}")
-                else:
-                    state['error'] = "Could not identify system action"
-                    print(f"[SYSTEM_CONTROL] No action detected for: '{user_input}'")
-                
-            except Exception as e:
-                state['error'] = f"Failed to parse command: {str(e)}"
-            
-            return state
-        
-        def execute_action_node(state: SystemState) -> SystemState:
-            """Execute the system action"""
-            try:
-                if state.get('error'):
-                    print(f"[SYSTEM_CONTROL] Skipping execution due to error: {state['error']}")
-                    return state
-                
-                action = state.get('action_type')
-                value = state.get('action_value')
-                
-                print(f"[SYSTEM_CONTROL] Executing action: {action} (value: {value})")
-                
-                result = self.system_tool._run(action, value)
-                
-                print(f"[SYSTEM_CONTROL] Result: {result}")
-                
-                if result['success']:
-                    state['response_message'] = result['message']
-                    if result.get('method'):
-                        state['response_message'] += f"\n🔧 Method: {result['method']}"
-                else:
-                    state['error'] = result.get('error')
-                    state['response_message'] = result['message']
-                    if result.get('suggestion'):
-                        state['response_message'] += f"\n💡 {result['suggestion']}"
-                
-            except Exception as e:
-                state['error'] = str(e)
-                state['response_message'] = f"❌ Failed to execute system action"
-            
-            return state
-        
-        # Build workflow
-        workflow = StateGraph(SystemState)
-        workflow.add_node("parse_command", parse_command_node)
-        workflow.add_node("execute_action", execute_action_node)
-        
-        workflow.set_entry_point("parse_command")
-        workflow.add_edge("parse_command", "execute_action")
-        workflow.add_edge("execute_action", END)
-        
-        return workflow.compile()
     
     def process_command(self, user_input: str) -> Dict[str, Any]:
         """Process system control command"""
         try:
+            # Fast path: keyword commands map deterministically to one tool call,
+            # so skip LangGraph dispatch and call the compiled plan directly
+            matched_phrase = _match_phrase(user_input.lower())
+            if matched_phrase:
+                detected_action = _ACTION_MAP[matched_phrase]
+                try:
+                    message, error = _format_result(self._compiled[matched_phrase]())
+                except Exception as e:
+                    message, error = "❌ Failed to execute system action", str(e)
+                return {
+                    "success": not bool(error),
+                    "message": message,
+                    "action_type": detected_action,
+                    "error": error
+                }
+            
+            # Unrecognized input goes through the full workflow
             initial_state: SystemState = {
                 "user_input": user_input,
                 "action_type": "",
@@ -620,10 +1006,3 @@ class SystemControlAgent:
 
 # Global agent instance
 system_control_agent = SystemControlAgent()
-
-# Print startup info
-if PYCAW_AVAILABLE:
-    print("[✅] System Control Agent: pycaw available - volume control will work!")
-else:
-    print("[⚠️] System Control Agent: pycaw not installed - volume control may not work")
-    print("[💡] For best results: pip install pycaw comtypes")
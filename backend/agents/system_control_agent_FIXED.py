@@ -3,274 +3,443 @@ FIXED System Control Agent - Actually Controls Windows Volume!
 This version uses Python libraries instead of unreliable subprocess commands.
 """
 
+import asyncio
+import functools
 import os
 import platform
 import subprocess
-from typing import Dict, Any, Optional, TypedDict, ClassVar
+import threading
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple, ClassVar
 from langchain.tools import BaseTool
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_groq import ChatGroq
 from langgraph.graph import StateGraph, END
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 from config import config
 
-# Try to import pycaw for Windows volume control
+# Windows Core Audio through a small ctypes COM binding - three vtable calls
+# don't justify loading pycaw/comtypes
 try:
-    from ctypes import cast, POINTER
-    from comtypes import CLSCTX_ALL
-    from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-    PYCAW_AVAILABLE = True
-except ImportError:
-    PYCAW_AVAILABLE = False
-    print("[WARNING] pycaw not installed. Volume control will use fallback methods.")
-    print("[FIX] Run: pip install pycaw comtypes")
+    import ctypes
+    import uuid
+    from ctypes import POINTER, byref, c_float, c_int, c_uint, c_ulong, c_void_p
+    from ctypes import HRESULT, WINFUNCTYPE
+    _ole32 = ctypes.oledll.ole32
+    CORE_AUDIO_AVAILABLE = True
+except (ImportError, AttributeError):
+    CORE_AUDIO_AVAILABLE = False
 
-class SystemState(TypedDict):
+if CORE_AUDIO_AVAILABLE:
+    class _GUID(ctypes.Structure):
+        _fields_ = [
+            ("Data1", c_ulong),
+            ("Data2", ctypes.c_ushort),
+            ("Data3", ctypes.c_ushort),
+            ("Data4", ctypes.c_ubyte * 8)
+        ]
+    
+    def _guid(text: str) -> "_GUID":
+        """Build a GUID structure from its string form"""
+        return _GUID.from_buffer_copy(uuid.UUID(text).bytes_le)
+    
+    _CLSID_MMDeviceEnumerator = _guid("BCDE0395-E52F-467C-8E3D-C4579291692E")
+    _IID_IMMDeviceEnumerator = _guid("A95664D2-9614-4F35-A746-DE8DB63617E6")
+    _IID_IAudioEndpointVolume = _guid("5CDF2C82-841E-4546-9722-0CF74078229A")
+    _CLSCTX_ALL = 0x17
+    _E_RENDER = 0
+    _E_CONSOLE = 0
+    _COINIT_MULTITHREADED = 0
+    
+    # (vtable slot, prototype) - slots 0-2 are IUnknown
+    _Release = (2, WINFUNCTYPE(c_ulong, c_void_p))
+    _GetDefaultAudioEndpoint = (4, WINFUNCTYPE(HRESULT, c_void_p, c_int, c_int, POINTER(c_void_p)))
+    _Activate = (3, WINFUNCTYPE(HRESULT, c_void_p, POINTER(_GUID), c_uint, c_void_p, POINTER(c_void_p)))
+    _SetMasterVolumeLevelScalar = (7, WINFUNCTYPE(HRESULT, c_void_p, c_float, POINTER(_GUID)))
+    _GetMasterVolumeLevelScalar = (9, WINFUNCTYPE(HRESULT, c_void_p, POINTER(c_float)))
+    _SetMute = (14, WINFUNCTYPE(HRESULT, c_void_p, c_int, POINTER(_GUID)))
+    
+    _com_thread_state = threading.local()
+
+def _com_call(ptr, method, *args):
+    """Call a COM method through the object's vtable (HRESULT failures raise OSError)"""
+    slot, prototype = method
+    vtable = ctypes.cast(ptr, POINTER(POINTER(c_void_p))).contents
+    return prototype(vtable[slot])(ptr, *args)
+
+def _ensure_com_initialized():
+    """Join the COM multithreaded apartment once per thread"""
+    if getattr(_com_thread_state, "initialized", False):
+        return
+    try:
+        _ole32.CoInitializeEx(None, _COINIT_MULTITHREADED)
+    except OSError:
+        pass  # Thread already initialized in another apartment mode - still usable
+    _com_thread_state.initialized = True
+
+def _activate_endpoint_volume() -> "c_void_p":
+    """Activate IAudioEndpointVolume on the default render endpoint"""
+    _ensure_com_initialized()
+    enumerator = c_void_p()
+    _ole32.CoCreateInstance(
+        byref(_CLSID_MMDeviceEnumerator), None, _CLSCTX_ALL,
+        byref(_IID_IMMDeviceEnumerator), byref(enumerator)
+    )
+    device = c_void_p()
+    try:
+        _com_call(enumerator, _GetDefaultAudioEndpoint, _E_RENDER, _E_CONSOLE, byref(device))
+    finally:
+        _com_call(enumerator, _Release)
+    endpoint = c_void_p()
+    try:
+        _com_call(device, _Activate, byref(_IID_IAudioEndpointVolume), _CLSCTX_ALL, None, byref(endpoint))
+    finally:
+        _com_call(device, _Release)
+    return endpoint
+
+# Resolved once - platform.system() probes the OS on every call
+_SYSTEM = platform.system()
+
+def _power_argv_for(system: str) -> Dict[str, Tuple[str, ...]]:
+    """Power command argv for one platform (Windows sleep goes through powrprof instead)"""
+    if system == "Windows":
+        return {
+            "shutdown": ("shutdown", "/s", "/t", "10"),
+            "restart": ("shutdown", "/r", "/t", "10")
+        }
+    return {
+        "shutdown": ("shutdown", "-h", "+1"),
+        "restart": ("shutdown", "-r", "+1"),
+        "sleep": ("pmset", "sleepnow") if system == "Darwin" else ("systemctl", "suspend")
+    }
+
+# Specialized to this platform at import
+_POWER_ARGV = _power_argv_for(_SYSTEM)
+_POWER_MESSAGES = {
+    "shutdown": "✅ Shutdown initiated (10 seconds)",
+    "restart": "✅ Restart initiated (10 seconds)",
+    "sleep": "✅ Sleep mode activated"
+}
+
+# One event loop, run forever on a daemon thread and started on first use -
+# sync callers submit to it instead of building a loop per command
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared background loop, starting its thread on first call"""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="system-control-loop", daemon=True).start()
+            _background_loop = loop
+        return _background_loop
+
+def _run_coroutine_sync(coro):
+    """Run a coroutine to completion from synchronous code (not from the background loop itself)"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_background_loop()).result()
+
+async def _exec_checked(argv, timeout: Optional[float] = None):
+    """Exec argv directly (no shell) and raise CalledProcessError on a non-zero exit.
+    A child still running after timeout seconds is killed (TimeoutExpired)"""
+    process = await asyncio.create_subprocess_exec(
+        *argv,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        _, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise subprocess.TimeoutExpired(argv, timeout)
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, argv, stderr=stderr)
+
+@dataclass(slots=True)
+class SystemState:
     """State for the System Control agent workflow"""
-    user_input: str
-    action_type: str
-    action_value: Optional[str]
-    response_message: str
-    error: Optional[str]
+    user_input: str = ""
+    action_type: str = ""
+    action_value: Optional[str] = None
+    response_message: str = ""
+    error: Optional[str] = None
+
+@dataclass(slots=True)
+class ToolResult:
+    """Outcome of a system control action"""
+    success: bool
+    message: str
+    action: Optional[str] = None
+    method: Optional[str] = None
+    error: Optional[str] = None
+    suggestion: Optional[str] = None
+    
+    def asdict(self) -> Dict[str, Any]:
+        """Dict form for LangChain callers - unset fields are omitted"""
+        return {name: value for name in self.__slots__ if (value := getattr(self, name)) is not None}
+
+def _ok(message: str, action: str, method: Optional[str] = None) -> ToolResult:
+    """Build a successful action result"""
+    return ToolResult(True, message, action, method)
+
+def _fail(message: str, error: str, suggestion: Optional[str] = None) -> ToolResult:
+    """Build a failed action result"""
+    return ToolResult(False, message, error=error, suggestion=suggestion)
 
 class SystemControlTool(BaseTool):
     """Tool for system control operations - FIXED VERSION"""
     name: str = "system_control"
     description: str = "Control system settings and operations"
     
+    # action -> (scalar delta, verb) for stepped volume changes
+    _VOL_STEPS: ClassVar[Dict[str, Tuple[float, str]]] = {
+        "volume_up": (+0.1, "increased"),
+        "volume_down": (-0.1, "decreased")
+    }
+    # action -> (SetMute flag, message)
+    _MUTE_STATES: ClassVar[Dict[str, Tuple[int, str]]] = {
+        "mute": (1, "✅ System muted"),
+        "unmute": (0, "✅ System unmuted")
+    }
+    _NIRCMD_ARGS: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "volume_up": ("changesysvolume", "5000"),
+        "volume_down": ("changesysvolume", "-5000"),
+        "mute": ("mutesysvolume", "1"),
+        "unmute": ("mutesysvolume", "0")
+    }
+    
+    # IAudioEndpointVolume pointer, reused across volume commands
+    _vol_ptr: Any = PrivateAttr(default=None)
+    # Volume handler for this platform, picked once
+    _volume_impl: Any = PrivateAttr(default=None)
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._volume_impl = {
+            "Windows": self._windows_volume_control,
+            "Darwin": self._macos_volume_control
+        }.get(_SYSTEM, self._linux_volume_control)
+        # The audio endpoint is activated on the first volume command, not
+        # here - constructing the tool must not touch COM or audio devices
+    
+    def _release_endpoint(self):
+        """Release the cached endpoint interface so the next command re-activates it"""
+        if self._vol_ptr is not None:
+            _com_call(self._vol_ptr, _Release)
+            self._vol_ptr = None
+    
+    def _get_master_volume(self) -> float:
+        """Read the master volume scalar (0.0-1.0)"""
+        level = c_float()
+        _com_call(self._vol_ptr, _GetMasterVolumeLevelScalar, byref(level))
+        return level.value
+    
+    def _core_audio_volume_action(self, action: str) -> ToolResult:
+        """Apply a volume action through the cached endpoint"""
+        _ensure_com_initialized()
+        if self._vol_ptr is None:
+            self._vol_ptr = _activate_endpoint_volume()
+        
+        step = self._VOL_STEPS.get(action)
+        if step is not None:
+            delta, verb = step
+            new_volume = max(0.0, min(1.0, self._get_master_volume() + delta))
+            _com_call(self._vol_ptr, _SetMasterVolumeLevelScalar, new_volume, None)
+            return _ok(f"✅ Volume {verb} to {int(new_volume * 100)}%", action, "core_audio")
+        
+        muted, message = self._MUTE_STATES[action]
+        _com_call(self._vol_ptr, _SetMute, muted, None)
+        return _ok(message, action, "core_audio")
+    
     def _run(self, action: str, value: str = None) -> Dict[str, Any]:
+        """Execute system control action - sync shim over _arun"""
+        return _run_coroutine_sync(self._arun(action, value))
+    
+    async def _arun(self, action: str, value: str = None) -> Dict[str, Any]:
+        """Execute system control action, as a dict for LangChain callers"""
+        return (await self._dispatch(action, value)).asdict()
+    
+    async def _dispatch(self, action: str, value: str = None) -> ToolResult:
         """Execute system control action - ACTUALLY WORKS NOW!"""
         try:
-            system = platform.system()
-            
             # VOLUME CONTROL - FIXED for Windows
             if action in ["volume_up", "volume_down", "mute", "unmute"]:
-                if system == "Windows":
-                    return self._windows_volume_control(action)
-                elif system == "Darwin":
-                    return self._macos_volume_control(action)
-                else:
-                    return self._linux_volume_control(action)
+                return await self._volume_impl(action)
             
             # LOCK SCREEN
             elif action == "lock":
-                return self._lock_screen(system)
+                return self._lock_screen(_SYSTEM)
             
             # POWER OPERATIONS
             elif action in ["shutdown", "restart", "sleep"]:
-                return self._power_operation(system, action)
+                return self._power_operation(_SYSTEM, action)
             
             else:
-                return {
-                    "success": False,
-                    "message": f"Unknown action: {action}",
-                    "error": "Unknown action"
-                }
+                return _fail(f"Unknown action: {action}", "Unknown action")
                 
         except Exception as e:
-            return {
-                "success": False,
-                "message": f"Failed to execute {action}: {str(e)}",
-                "error": str(e)
-            }
+            return _fail(f"Failed to execute {action}: {str(e)}", str(e))
     
-    def _windows_volume_control(self, action: str) -> Dict[str, Any]:
+    async def _windows_volume_control(self, action: str) -> ToolResult:
         """Windows volume control - FIXED VERSION"""
         try:
-            if PYCAW_AVAILABLE:
-                # Use pycaw - ACTUALLY WORKS!
-                devices = AudioUtilities.GetSpeakers()
-                interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-                volume = cast(interface, POINTER(IAudioEndpointVolume))
-                
-                if action == "volume_up":
-                    current = volume.GetMasterVolumeLevelScalar()
-                    new_volume = min(1.0, current + 0.1)  # +10%
-                    volume.SetMasterVolumeLevelScalar(new_volume, None)
-                    percent = int(new_volume * 100)
-                    return {
-                        "success": True,
-                        "message": f"✅ Volume increased to {percent}%",
-                        "action": action,
-                        "method": "pycaw"
-                    }
-                
-                elif action == "volume_down":
-                    current = volume.GetMasterVolumeLevelScalar()
-                    new_volume = max(0.0, current - 0.1)  # -10%
-                    volume.SetMasterVolumeLevelScalar(new_volume, None)
-                    percent = int(new_volume * 100)
-                    return {
-                        "success": True,
-                        "message": f"✅ Volume decreased to {percent}%",
-                        "action": action,
-                        "method": "pycaw"
-                    }
-                
-                elif action == "mute":
-                    volume.SetMute(1, None)
-                    return {
-                        "success": True,
-                        "message": "✅ System muted",
-                        "action": action,
-                        "method": "pycaw"
-                    }
-                
-                elif action == "unmute":
-                    volume.SetMute(0, None)
-                    return {
-                        "success": True,
-                        "message": "✅ System unmuted",
-                        "action": action,
-                        "method": "pycaw"
-                    }
+            if CORE_AUDIO_AVAILABLE:
+                # Core Audio through ctypes - ACTUALLY WORKS!
+                try:
+                    return self._core_audio_volume_action(action)
+                except OSError:
+                    # Default device changed or endpoint went stale - re-activate once
+                    self._release_endpoint()
+                    return self._core_audio_volume_action(action)
             
             else:
                 # Fallback: Try nircmd if available
                 nircmd_path = "nircmd.exe"  # Assumes in PATH or System32
                 
-                commands = {
-                    "volume_up": [nircmd_path, "changesysvolume", "5000"],
-                    "volume_down": [nircmd_path, "changesysvolume", "-5000"],
-                    "mute": [nircmd_path, "mutesysvolume", "1"],
-                    "unmute": [nircmd_path, "mutesysvolume", "0"]
-                }
-                
                 try:
-                    subprocess.run(commands[action], check=True, timeout=2)
-                    return {
-                        "success": True,
-                        "message": f"✅ {action.replace('_', ' ').title()} executed (nircmd)",
-                        "action": action,
-                        "method": "nircmd"
-                    }
-                except (FileNotFoundError, subprocess.CalledProcessError):
-                    return {
-                        "success": False,
-                        "message": f"❌ Volume control not available",
-                        "error": "pycaw not installed and nircmd not found",
-                        "suggestion": "Install pycaw: pip install pycaw comtypes"
-                    }
+                    await _exec_checked([nircmd_path, *self._NIRCMD_ARGS[action]], timeout=2)
+                    return _ok(f"✅ {action.replace('_', ' ').title()} executed (nircmd)", action, "nircmd")
+                except (FileNotFoundError, subprocess.CalledProcessError, subprocess.TimeoutExpired):
+                    return _fail(
+                        f"❌ Volume control not available",
+                        "Core Audio unavailable and nircmd not found",
+                        "Install nircmd and add it to PATH"
+                    )
         
         except Exception as e:
-            return {
-                "success": False,
-                "message": f"❌ Windows volume control failed: {str(e)}",
-                "error": str(e)
-            }
+            return _fail(f"❌ Windows volume control failed: {str(e)}", str(e))
     
-    def _macos_volume_control(self, action: str) -> Dict[str, Any]:
+    async def _macos_volume_control(self, action: str) -> ToolResult:
         """macOS volume control"""
         try:
             commands = {
-                "volume_up": "osascript -e 'set volume output volume (output volume of (get volume settings) + 10)'",
-                "volume_down": "osascript -e 'set volume output volume (output volume of (get volume settings) - 10)'",
-                "mute": "osascript -e 'set volume output muted true'",
-                "unmute": "osascript -e 'set volume output muted false'"
+                "volume_up": ["osascript", "-e", "set volume output volume (output volume of (get volume settings) + 10)"],
+                "volume_down": ["osascript", "-e", "set volume output volume (output volume of (get volume settings) - 10)"],
+                "mute": ["osascript", "-e", "set volume output muted true"],
+                "unmute": ["osascript", "-e", "set volume output muted false"]
             }
             
-            subprocess.run(commands[action], shell=True, check=True)
-            return {
-                "success": True,
-                "message": f"✅ {action.replace('_', ' ').title()} executed",
-                "action": action
-            }
+            await _exec_checked(commands[action])
+            return _ok(f"✅ {action.replace('_', ' ').title()} executed", action)
         except Exception as e:
-            return {
-                "success": False,
-                "message": f"❌ macOS volume control failed: {str(e)}",
-                "error": str(e)
-            }
+            return _fail(f"❌ macOS volume control failed: {str(e)}", str(e))
     
-    def _linux_volume_control(self, action: str) -> Dict[str, Any]:
+    async def _linux_volume_control(self, action: str) -> ToolResult:
         """Linux volume control"""
         try:
             commands = {
-                "volume_up": "amixer -D pulse sset Master 10%+",
-                "volume_down": "amixer -D pulse sset Master 10%-",
-                "mute": "amixer -D pulse sset Master mute",
-                "unmute": "amixer -D pulse sset Master unmute"
+                "volume_up": ["amixer", "-D", "pulse", "sset", "Master", "10%+"],
+                "volume_down": ["amixer", "-D", "pulse", "sset", "Master", "10%-"],
+                "mute": ["amixer", "-D", "pulse", "sset", "Master", "mute"],
+                "unmute": ["amixer", "-D", "pulse", "sset", "Master", "unmute"]
             }
             
-            subprocess.run(commands[action], shell=True, check=True)
-            return {
-                "success": True,
-                "message": f"✅ {action.replace('_', ' ').title()} executed",
-                "action": action
-            }
+            await _exec_checked(commands[action])
+            return _ok(f"✅ {action.replace('_', ' ').title()} executed", action)
         except Exception as e:
-            return {
-                "success": False,
-                "message": f"❌ Linux volume control failed: {str(e)}",
-                "error": str(e)
-            }
+            return _fail(f"❌ Linux volume control failed: {str(e)}", str(e))
     
-    def _lock_screen(self, system: str) -> Dict[str, Any]:
+    def _lock_screen(self, system: str) -> ToolResult:
         """Lock screen - cross-platform"""
         try:
-            commands = {
-                "Windows": "rundll32.exe user32.dll,LockWorkStation",
-                "Darwin": "pmset displaysleepnow",
-                "Linux": "xdg-screensaver lock"
-            }
+            if system == "Windows":
+                # Call user32 directly - no shell or rundll32 process needed
+                import ctypes
+                if not ctypes.windll.user32.LockWorkStation():
+                    raise ctypes.WinError()
+            else:
+                commands = {
+                    "Darwin": ["pmset", "displaysleepnow"],
+                    "Linux": ["xdg-screensaver", "lock"]
+                }
+                # Fire-and-forget: Popen returns as soon as the process is spawned
+                subprocess.Popen(commands[system])
             
-            subprocess.Popen(commands[system], shell=True)
-            return {
-                "success": True,
-                "message": "✅ Screen locked",
-                "action": "lock"
-            }
+            return _ok("✅ Screen locked", "lock")
         except Exception as e:
-            return {
-                "success": False,
-                "message": f"❌ Lock screen failed: {str(e)}",
-                "error": str(e)
-            }
+            return _fail(f"❌ Lock screen failed: {str(e)}", str(e))
     
-    def _power_operation(self, system: str, action: str) -> Dict[str, Any]:
+    def _power_operation(self, system: str, action: str) -> ToolResult:
         """Power operations (shutdown, restart, sleep)"""
         try:
-            commands = {
-                "Windows": {
-                    "shutdown": "shutdown /s /t 10",
-                    "restart": "shutdown /r /t 10",
-                    "sleep": "rundll32.exe powrprof.dll,SetSuspendState 0,1,0"
-                },
-                "Darwin": {
-                    "shutdown": "shutdown -h +1",
-                    "restart": "shutdown -r +1",
-                    "sleep": "pmset sleepnow"
-                },
-                "Linux": {
-                    "shutdown": "shutdown -h +1",
-                    "restart": "shutdown -r +1",
-                    "sleep": "systemctl suspend"
-                }
-            }
-            
-            subprocess.Popen(commands[system][action], shell=True)
+            if system == "Windows" and action == "sleep":
+                # Call powrprof directly instead of spawning rundll32. SetSuspendState only
+                # returns after the machine wakes, so issue it off the calling thread
+                import ctypes
+                from ctypes import wintypes
+                threading.Thread(
+                    target=ctypes.windll.powrprof.SetSuspendState,
+                    args=(wintypes.BOOLEAN(0), wintypes.BOOLEAN(1), wintypes.BOOLEAN(0)),
+                    daemon=True
+                ).start()
+                return _ok("✅ Sleep mode activated", action)
             
-            messages = {
-                "shutdown": "✅ Shutdown initiated (10 seconds)",
-                "restart": "✅ Restart initiated (10 seconds)",
-                "sleep": "✅ Sleep mode activated"
-            }
+            # Fire-and-forget: Popen returns as soon as the process is spawned
+            subprocess.Popen(_POWER_ARGV[action])
             
-            return {
-                "success": True,
-                "message": messages[action],
-                "action": action
-            }
+            return _ok(_POWER_MESSAGES[action], action)
         except Exception as e:
-            return {
-                "success": False,
-                "message": f"❌ Power operation failed: {str(e)}",
-                "error": str(e)
-            }
+            return _fail(f"❌ Power operation failed: {str(e)}", str(e))
+
+# Stripped from utterance words before token matching
+_WORD_PUNCTUATION = ".,!?;:'\""
+
+def _token_table(items, order_sensitive) -> Tuple[Tuple[frozenset, str, Optional[str]], ...]:
+    """Turn (phrase, action) pairs into token-set matchers, most words first"""
+    ordered = sorted(items, key=lambda item: len(item[0].split()), reverse=True)
+    return tuple(
+        (frozenset(phrase.split()), action, phrase if phrase in order_sensitive else None)
+        for phrase, action in ordered
+    )
+
+def _apply_update(state: SystemState, update: Dict[str, Any]):
+    """Merge a node's partial update into the state, as the graph would"""
+    for key, value in update.items():
+        setattr(state, key, value)
+
+# Shared tool instance - the compiled workflow is process-wide, so is its tool
+_SYSTEM_TOOL = SystemControlTool()
+# Bound once: nodes call the tool body directly, skipping BaseTool.run's
+# input validation and callback plumbing
+_execute = _SYSTEM_TOOL._dispatch
 
 class SystemControlAgent:
     """System Control Agent with LangGraph workflow"""
     
+    # Spoken phrase -> system action
+    _ACTION_ITEMS: ClassVar[Tuple[Tuple[str, str], ...]] = (
+        ("volume up", "volume_up"),
+        ("increase volume", "volume_up"),
+        ("louder", "volume_up"),
+        ("raise volume", "volume_up"),
+        ("volume down", "volume_down"),
+        ("decrease volume", "volume_down"),
+        ("quieter", "volume_down"),
+        ("lower volume", "volume_down"),
+        ("mute", "mute"),
+        ("unmute", "unmute"),
+        ("lock", "lock"),
+        ("lock screen", "lock"),
+        ("lock computer", "lock"),
+        ("shutdown", "shutdown"),
+        ("shut down", "shutdown"),
+        ("turn off", "shutdown"),
+        ("restart", "restart"),
+        ("reboot", "restart"),
+        ("sleep", "sleep"),
+        ("hibernate", "sleep"),
+    )
+    
+    # Phrases whose word order carries the meaning - also require the exact phrase
+    _ORDER_SENSITIVE: ClassVar[frozenset] = frozenset({"shut down", "turn off"})
+    # (phrase tokens, action, exact phrase or None), longest phrases first so
+    # "lock screen" is preferred over "lock"
+    _ACTION_BY_TOKENS: ClassVar[Tuple[Tuple[frozenset, str, Optional[str]], ...]] = _token_table(
+        _ACTION_ITEMS, _ORDER_SENSITIVE
+    )
+    
     def __init__(self):
         self.llm = ChatGroq(
             groq_api_key=config.GROQ_API_KEY,
@@ -279,91 +448,63 @@ class SystemControlAgent:
             max_tokens=config.MAX_RESPONSE_TOKENS
         )
         
-        self.system_tool = SystemControlTool()
+        self.system_tool = _SYSTEM_TOOL
         self.workflow = self._build_workflow()
     
-    def _build_workflow(self) -> StateGraph:
-        """Build LangGraph workflow"""
-        
-        def parse_command_node(state: SystemState) -> SystemState:
-            """Parse system control command"""
-            try:
-                user_input = state['user_input'].lower()
-                
-                # Map user input to actions
-                action_mapping = {
-                    "volume up": "volume_up",
-                    "increase volume": "volume_up",
-                    "louder": "volume_up",
-                    "raise volume": "volume_up",
-                    "volume down": "volume_down",
-                    "decrease volume": "volume_down",
-                    "quieter": "volume_down",
-                    "lower volume": "volume_down",
-                    "mute": "mute",
-                    "unmute": "unmute",
-                    "lock": "lock",
-                    "lock screen": "lock",
-                    "lock computer": "lock",
-                    "shutdown": "shutdown",
-                    "shut down": "shutdown",
-                    "turn off": "shutdown",
-                    "restart": "restart",
-                    "reboot": "restart",
-                    "sleep": "sleep",
-                    "hibernate": "sleep"
-                }
-                
-                # Find matching action
-                detected_action = None
-                for phrase, action in action_mapping.items():
-                    if phrase in user_input:
-                        detected_action = action
-                        break
-                
-                if detected_action:
-                    state['action_type'] = detected_action
-                    state['action_value'] = None
-                    state['error'] = None
-                else:
-                    state['error'] = "Could not identify system action"
-                
-            except Exception as e:
-                state['error'] = f"Failed to parse command: {str(e)}"
+    @staticmethod
+    def _parse_command_node(state: SystemState) -> Dict[str, Any]:
+        """Parse system control command"""
+        try:
+            user_input = state.user_input.lower()
+            tokens = frozenset(word.strip(_WORD_PUNCTUATION) for word in user_input.split())
             
-            return state
-        
-        def execute_action_node(state: SystemState) -> SystemState:
-            """Execute the system action"""
-            try:
-                if state.get('error'):
-                    return state
-                
-                action = state.get('action_type')
-                value = state.get('action_value')
-                
-                result = self.system_tool._run(action, value)
-                
-                if result['success']:
-                    state['response_message'] = result['message']
-                    if result.get('method'):
-                        state['response_message'] += f"\n🔧 Method: {result['method']}"
-                else:
-                    state['error'] = result.get('error')
-                    state['response_message'] = result['message']
-                    if result.get('suggestion'):
-                        state['response_message'] += f"\n💡 {result['suggestion']}"
-                
-            except Exception as e:
-                state['error'] = str(e)
-                state['response_message'] = f"❌ Failed to execute system action"
+            # Hash lookups against each phrase's token set instead of substring scans
+            detected_action = next(
+                (
+                    action
+                    for phrase_tokens, action, exact in SystemControlAgent._ACTION_BY_TOKENS
+                    if phrase_tokens <= tokens and (exact is None or exact in user_input)
+                ),
+                None
+            )
             
-            return state
-        
-        # Build workflow
+            if detected_action:
+                return {"action_type": detected_action, "action_value": None, "error": None}
+            return {"error": "Could not identify system action"}
+            
+        except Exception as e:
+            return {"error": f"Failed to parse command: {str(e)}"}
+    
+    @staticmethod
+    async def _execute_action_node(state: SystemState) -> Dict[str, Any]:
+        """Execute the system action"""
+        try:
+            if state.error:
+                return {}
+            
+            result = await _execute(state.action_type, state.action_value)
+            
+            if result.success:
+                response_message = result.message
+                if result.method:
+                    response_message += f"\n🔧 Method: {result.method}"
+                return {"response_message": response_message}
+            
+            response_message = result.message
+            if result.suggestion:
+                response_message += f"\n💡 {result.suggestion}"
+            return {"error": result.error, "response_message": response_message}
+            
+        except Exception as e:
+            return {"error": str(e), "response_message": f"❌ Failed to execute system action"}
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _build_workflow() -> StateGraph:
+        """Build LangGraph workflow (compiled once per process)"""
         workflow = StateGraph(SystemState)
-        workflow.add_node("parse_command", parse_command_node)
-        workflow.add_node("execute_action", execute_action_node)
+        workflow.add_node("parse_command", SystemControlAgent._parse_command_node)
+        workflow.add_node("execute_action", SystemControlAgent._execute_action_node)
         
         workflow.set_entry_point("parse_command")
         workflow.add_edge("parse_command", "execute_action")
@@ -371,24 +512,29 @@ class SystemControlAgent:
         
         return workflow.compile()
     
+    async def process_command_fast(self, user_input: str) -> SystemState:
+        """Run parse -> execute inline, without the StateGraph scheduler"""
+        state = SystemState(user_input=user_input)
+        _apply_update(state, self._parse_command_node(state))
+        _apply_update(state, await self._execute_action_node(state))
+        return state
+    
     def process_command(self, user_input: str) -> Dict[str, Any]:
-        """Process system control command"""
+        """Process system control command - sync wrapper over aprocess_command"""
+        return _run_coroutine_sync(self.aprocess_command(user_input))
+    
+    async def aprocess_command(self, user_input: str) -> Dict[str, Any]:
+        """Process system control command without blocking the event loop"""
         try:
-            initial_state: SystemState = {
-                "user_input": user_input,
-                "action_type": "",
-                "action_value": None,
-                "response_message": "",
-                "error": None
-            }
-            
-            result = self.workflow.invoke(initial_state)
+            # The graph is a fixed two-node chain, so run it inline;
+            # self.workflow is kept for introspection and future branching
+            state = await self.process_command_fast(user_input)
             
             return {
-                "success": not bool(result.get('error')),
-                "message": result.get('response_message', 'System action completed'),
-                "action_type": result.get('action_type'),
-                "error": result.get('error')
+                "success": not bool(state.error),
+                "message": state.response_message,
+                "action_type": state.action_type,
+                "error": state.error
             }
             
         except Exception as e:
@@ -403,8 +549,7 @@ class SystemControlAgent:
 system_control_agent = SystemControlAgent()
 
 # Print startup info
-if PYCAW_AVAILABLE:
-    print("[✅] System Control Agent: pycaw available - volume control will work!")
+if CORE_AUDIO_AVAILABLE:
+    print("[✅] System Control Agent: Core Audio available - volume control will work!")
 else:
-    print("[⚠️] System Control Agent: pycaw not installed - volume control may not work")
-    print("[💡] For best results: pip install pycaw comtypes")
+    print("[⚠️] System Control Agent: Core Audio not available - using fallback volume commands")
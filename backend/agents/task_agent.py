@@ -3,17 +3,59 @@ Task and Reminder Agent for AI Task Automation Assistant
 Manages tasks, to-do lists, and reminders
 """
 
+import atexit
+import contextlib
+import functools
+import itertools
 import json
+import mmap
 import os
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, TypedDict, ClassVar
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Set, Tuple, ClassVar
 from langchain.tools import BaseTool
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_groq import ChatGroq
 from langgraph.graph import StateGraph, END
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from config import config
 
+def _trigrams(text: str) -> Set[str]:
+    """Every 3-character window of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+# flock serializes the task files between processes (uvicorn's reloader and
+# worker, crew_main) - POSIX only; elsewhere each process locks just itself
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# orjson serializes tasks several times faster than stdlib json - optional
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _dumps(data: Dict, human_readable: bool = False) -> bytes:
+    """Serialize to JSON bytes - compact unless human_readable"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if human_readable else 0)
+    if human_readable:
+        return json.dumps(data, indent=2).encode()
+    return json.dumps(data, separators=(",", ":")).encode()
+
+def _loads(raw) -> Dict:
+    """Parse JSON from bytes or a memoryview"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(bytes(raw))
+
 class Task(BaseModel):
     """Task structure"""
     id: str
@@ -24,14 +66,15 @@ class Task(BaseModel):
     completed: bool = False
     created_at: str = ""
 
-class AgentState(TypedDict):
+@dataclass(slots=True)
+class AgentState:
     """State for the Task agent workflow"""
-    user_input: str
-    parsed_command: Dict[str, Any]
-    action: str  # add, list, complete, delete
-    task_data: Optional[Dict[str, Any]]
-    response_message: str
-    error: Optional[str]
+    user_input: str = ""
+    parsed_command: Dict[str, Any] = field(default_factory=dict)
+    action: str = ""  # add, list, complete, delete
+    task_data: Optional[Dict[str, Any]] = None
+    response_message: str = ""
+    error: Optional[str] = None
 
 class TaskManagerTool(BaseTool):
     """Tool to manage tasks and reminders"""
@@ -39,54 +82,230 @@ class TaskManagerTool(BaseTool):
     description: str = "Manage tasks, to-do lists, and reminders"
     
     TASKS_FILE: ClassVar[str] = "tasks.json"
+    TASKS_LOG: ClassVar[str] = "tasks.log"  # append-only mutations since the last compaction
+    COMPACT_DELAY: ClassVar[float] = 30.0  # seconds before logged changes fold into tasks.json
+    HUMAN_READABLE: ClassVar[bool] = False  # indent tasks.json for hand editing
+    
+    _tasks_by_id: Dict[str, Dict] = PrivateAttr(default_factory=dict)
+    _lower_titles: Dict[str, str] = PrivateAttr(default_factory=dict)
+    _trigram_index: Dict[str, Set[str]] = PrivateAttr(default_factory=lambda: defaultdict(set))
+    _order: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _sequence: Any = PrivateAttr(default_factory=itertools.count)
+    _id_counter: Any = PrivateAttr(default_factory=lambda: itertools.count(1))
+    _dirty: bool = PrivateAttr(default=False)
+    # Bytes of the log already applied, and the (inode, mtime, size) of the
+    # tasks.json they were applied on - a new stamp means another process compacted
+    _log_offset: int = PrivateAttr(default=0)
+    _snapshot_stamp: Any = PrivateAttr(default=None)
+    _compact_timer: Optional[threading.Timer] = PrivateAttr(default=None)
+    _log_fd: Optional[int] = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default_factory=threading.RLock)
     
     def __init__(self):
         super().__init__()
-        self._ensure_tasks_file()
+        self._log_fd = os.open(self.TASKS_LOG, os.O_RDWR | os.O_CREAT | os.O_APPEND)
+        with self._lock, self._locked_files(exclusive=True):
+            self._ensure_tasks_file()
+            size = os.fstat(self._log_fd).st_size
+            if size and self._read_log(size - 1) != b"\n":
+                os.write(self._log_fd, b"\n")  # Keep the next entry off a torn final line
+            self._refresh()
+        atexit.register(self._compact)
+    
+    @contextlib.contextmanager
+    def _locked_files(self, exclusive: bool):
+        """Hold the cross-process lock on tasks.json and the log"""
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._log_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._log_fd, fcntl.LOCK_UN)
+    
+    def _stamp(self):
+        """Identify the current tasks.json - os.replace gives each snapshot a new one"""
+        st = os.stat(self.TASKS_FILE)
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+    
+    def _refresh(self):
+        """Catch up with changes other processes made (caller holds the file lock)"""
+        stamp = self._stamp()
+        if stamp != self._snapshot_stamp or os.fstat(self._log_fd).st_size < self._log_offset:
+            # Compacted elsewhere - rebuild from the new snapshot and its log
+            self._tasks_by_id.clear()
+            self._lower_titles.clear()
+            self._trigram_index.clear()
+            self._order.clear()
+            for task in self._load_tasks():
+                self._index_task(task)
+            self._snapshot_stamp = stamp
+            self._log_offset = 0
+        if self._replay_log():
+            self._mark_dirty()
     
     def _ensure_tasks_file(self):
         """Ensure tasks file exists"""
         if not os.path.exists(self.TASKS_FILE):
-            with open(self.TASKS_FILE, 'w') as f:
-                json.dump({"tasks": []}, f)
+            self._save_tasks([])
     
     def _load_tasks(self) -> List[Dict]:
-        """Load tasks from file"""
+        """Load tasks from file (parsed straight from a read-only mmap, no read() copy)"""
         try:
-            with open(self.TASKS_FILE, 'r') as f:
-                data = json.load(f)
-                return data.get("tasks", [])
+            with open(self.TASKS_FILE, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return []  # mmap cannot map an empty file
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    with memoryview(mapped) as view:
+                        data = _loads(view)
+            return data.get("tasks", [])
         except:
             return []
     
     def _save_tasks(self, tasks: List[Dict]):
-        """Save tasks to file"""
-        with open(self.TASKS_FILE, 'w') as f:
-            json.dump({"tasks": tasks}, f, indent=2)
+        """Save tasks to file (atomically, via a temp file and os.replace)"""
+        temp_path = Path(f"{self.TASKS_FILE}.tmp")
+        temp_path.write_bytes(_dumps({"tasks": tasks}, self.HUMAN_READABLE))
+        os.replace(temp_path, self.TASKS_FILE)
+    
+    def _index_task(self, task: Dict):
+        """Add a task to the id map and the title trigram index"""
+        task_id = task["id"]
+        lower_title = task["title"].lower()
+        self._tasks_by_id[task_id] = task
+        self._lower_titles[task_id] = lower_title
+        self._order[task_id] = next(self._sequence)
+        for trigram in _trigrams(lower_title):
+            self._trigram_index[trigram].add(task_id)
+    
+    def _unindex_task(self, task: Dict):
+        """Remove a task from the id map and the title trigram index"""
+        task_id = task["id"]
+        self._tasks_by_id.pop(task_id, None)
+        self._order.pop(task_id, None)
+        for trigram in _trigrams(self._lower_titles.pop(task_id, "")):
+            ids = self._trigram_index.get(trigram)
+            if ids is not None:
+                ids.discard(task_id)
+                if not ids:
+                    del self._trigram_index[trigram]
+    
+    def _find_task(self, task_id: Optional[str], task_title: Optional[str]) -> Optional[Dict]:
+        """Find a task by id, else by title substring (earliest task wins)"""
+        if task_id and task_id in self._tasks_by_id:
+            return self._tasks_by_id[task_id]
+        if not task_title:
+            return None
+        
+        needle = task_title.lower()
+        needle_trigrams = _trigrams(needle)
+        if needle_trigrams:
+            # A title containing the needle contains all of its trigrams
+            if not all(trigram in self._trigram_index for trigram in needle_trigrams):
+                return None
+            candidates = set.intersection(*(self._trigram_index[trigram] for trigram in needle_trigrams))
+        else:
+            candidates = self._lower_titles.keys()  # Needle too short to index
+        
+        matches = [task_id for task_id in candidates if needle in self._lower_titles[task_id]]
+        if not matches:
+            return None
+        return self._tasks_by_id[min(matches, key=self._order.__getitem__)]
+    
+    def _append(self, op: str, payload: Dict):
+        """Record one mutation as a JSON line in the log (a single O_APPEND write)"""
+        os.write(self._log_fd, _dumps({"op": op, **payload}) + b"\n")
+        self._mark_dirty()
+    
+    def _read_log(self, offset: int) -> bytes:
+        """Read the log from offset to its end"""
+        os.lseek(self._log_fd, offset, os.SEEK_SET)
+        chunks = []
+        while chunk := os.read(self._log_fd, 1 << 16):
+            chunks.append(chunk)
+        return b"".join(chunks)
+    
+    def _replay_log(self) -> int:
+        """Apply log entries past _log_offset; returns how many were applied"""
+        raw = self._read_log(self._log_offset)
+        # Entries this process wrote come back here too; replays are idempotent.
+        # Whole lines only - a partial last line is picked up once completed
+        raw = raw[:raw.rfind(b"\n") + 1]
+        self._log_offset += len(raw)
+        
+        applied = 0
+        for line in raw.splitlines():
+            try:
+                entry = _loads(line)
+            except ValueError:
+                continue  # Torn final line from a crash mid-write
+            op = entry.get("op")
+            # Replays must be idempotent: a crash between compaction's replace and
+            # truncate leaves already-applied entries in the log
+            if op == "add" and entry["task"]["id"] not in self._tasks_by_id:
+                self._index_task(entry["task"])
+            elif op == "complete" and entry["id"] in self._tasks_by_id:
+                self._tasks_by_id[entry["id"]]["completed"] = True
+            elif op == "delete" and entry["id"] in self._tasks_by_id:
+                self._unindex_task(self._tasks_by_id[entry["id"]])
+            else:
+                continue
+            applied += 1
+        return applied
+    
+    def _mark_dirty(self):
+        """Schedule compaction of the log into tasks.json"""
+        with self._lock:
+            self._dirty = True
+            if self._compact_timer is None:
+                self._compact_timer = threading.Timer(self.COMPACT_DELAY, self._compact)
+                self._compact_timer.daemon = True
+                self._compact_timer.start()
+    
+    def _compact(self):
+        """Rewrite tasks.json from memory and truncate the log"""
+        with self._lock:
+            timer, self._compact_timer = self._compact_timer, None
+            if timer is not None:
+                timer.cancel()
+            if not self._dirty:
+                return
+            with self._locked_files(exclusive=True):
+                # Other processes may have logged since we last looked; fold
+                # their entries in so the snapshot and truncate lose nothing
+                self._refresh()
+                self._save_tasks(list(self._tasks_by_id.values()))
+                os.ftruncate(self._log_fd, 0)
+                self._snapshot_stamp = self._stamp()
+                self._log_offset = 0
+            self._dirty = False
     
     def _run(self, action: str, task_data: Dict = None) -> str:
         """Perform task management action"""
         try:
-            if action == "add":
-                return self._add_task(task_data)
-            elif action == "list":
-                return self._list_tasks(task_data)
-            elif action == "complete":
-                return self._complete_task(task_data)
-            elif action == "delete":
-                return self._delete_task(task_data)
-            else:
-                return f"Unknown action: {action}"
+            with self._lock, self._locked_files(exclusive=action != "list"):
+                self._refresh()
+                if action == "add":
+                    return self._add_task(task_data)
+                elif action == "list":
+                    return self._list_tasks(task_data)
+                elif action == "complete":
+                    return self._complete_task(task_data)
+                elif action == "delete":
+                    return self._delete_task(task_data)
+                else:
+                    return f"Unknown action: {action}"
                 
         except Exception as e:
             return f"Error managing task: {str(e)}"
     
     def _add_task(self, task_data: Dict) -> str:
         """Add a new task"""
-        tasks = self._load_tasks()
-        
-        # Create new task
-        task_id = f"task_{len(tasks) + 1}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        # Create new task - one clock read; epoch seconds, the pid and a
+        # per-process counter keep ids unique across processes and within a second
+        now = datetime.now()
+        task_id = f"task_{int(now.timestamp())}_{os.getpid()}_{next(self._id_counter)}"
         new_task = {
             "id": task_id,
             "title": task_data.get("title", "Untitled Task"),
@@ -94,17 +313,18 @@ class TaskManagerTool(BaseTool):
             "due_date": task_data.get("due_date"),
             "priority": task_data.get("priority", "medium"),
             "completed": False,
-            "created_at": datetime.now().isoformat()
+            "created_at": now.isoformat()
         }
         
-        tasks.append(new_task)
-        self._save_tasks(tasks)
+        # Logged first: memory only changes once the entry is durable
+        self._append("add", {"task": new_task})
+        self._index_task(new_task)
         
         return f"Task added: {new_task['title']}"
     
     def _list_tasks(self, filters: Dict = None) -> str:
         """List all tasks"""
-        tasks = self._load_tasks()
+        tasks = list(self._tasks_by_id.values())
         
         if not tasks:
             return "No tasks found"
@@ -135,37 +355,60 @@ class TaskManagerTool(BaseTool):
     
     def _complete_task(self, task_data: Dict) -> str:
         """Mark task as completed"""
-        tasks = self._load_tasks()
-        task_id = task_data.get("task_id")
-        task_title = task_data.get("title")
-        
-        # Find task by ID or title
-        for task in tasks:
-            if (task_id and task["id"] == task_id) or (task_title and task_title.lower() in task["title"].lower()):
-                task["completed"] = True
-                self._save_tasks(tasks)
-                return f"Task completed: {task['title']}"
+        task = self._find_task(task_data.get("task_id"), task_data.get("title"))
+        if task is None:
+            return "Task not found"
         
-        return "Task not found"
+        self._append("complete", {"id": task["id"]})
+        task["completed"] = True
+        return f"Task completed: {task['title']}"
     
     def _delete_task(self, task_data: Dict) -> str:
         """Delete a task"""
-        tasks = self._load_tasks()
-        task_id = task_data.get("task_id")
-        task_title = task_data.get("title")
-        
-        # Find and remove task
-        for i, task in enumerate(tasks):
-            if (task_id and task["id"] == task_id) or (task_title and task_title.lower() in task["title"].lower()):
-                removed_task = tasks.pop(i)
-                self._save_tasks(tasks)
-                return f"Task deleted: {removed_task['title']}"
+        task = self._find_task(task_data.get("task_id"), task_data.get("title"))
+        if task is None:
+            return "Task not found"
         
-        return "Task not found"
+        self._append("delete", {"id": task["id"]})
+        self._unindex_task(task)
+        return f"Task deleted: {task['title']}"
+
+def _apply_update(state: AgentState, update: Dict[str, Any]):
+    """Merge a node's partial update into the state, as the graph would"""
+    for key, value in update.items():
+        setattr(state, key, value)
+
+# Shared tool instance - the compiled workflow is process-wide, so is its tool
+_TASK_TOOL = TaskManagerTool()
+# Bound once: nodes call the tool body directly, skipping BaseTool.run's
+# input validation and callback plumbing
+_execute = _TASK_TOOL._run
+
+def _keyword_pattern(*keywords: str) -> re.Pattern:
+    """Compile keywords into one substring-matching alternation"""
+    return re.compile("|".join(map(re.escape, keywords)))
+
+# Action keywords stripped from a command to leave the task title
+_TASK_KEYWORDS_RE = _keyword_pattern(
+    "add task", "create task", "new task", "remind me to", "complete", "delete", "remove"
+)
+_HIGH_PRIORITY_RE = _keyword_pattern("high", "urgent", "important")
 
 class TaskAgent:
     """LangGraph-powered Task Management Agent"""
     
+    # Action keywords - matched as substrings so "completed"/"finished" still count
+    _ADD_KW: ClassVar[Tuple[str, ...]] = ("add", "create", "new", "remind me")
+    _LIST_KW: ClassVar[Tuple[str, ...]] = ("list", "show", "what are", "my tasks")
+    _COMPLETE_KW: ClassVar[Tuple[str, ...]] = ("complete", "done", "finish", "mark")
+    _DELETE_KW: ClassVar[Tuple[str, ...]] = ("delete", "remove", "cancel")
+    
+    # Action keyword matchers, checked in priority order
+    _ADD_RE: ClassVar[re.Pattern] = _keyword_pattern(*_ADD_KW)
+    _LIST_RE: ClassVar[re.Pattern] = _keyword_pattern(*_LIST_KW)
+    _COMPLETE_RE: ClassVar[re.Pattern] = _keyword_pattern(*_COMPLETE_KW)
+    _DELETE_RE: ClassVar[re.Pattern] = _keyword_pattern(*_DELETE_KW)
+    
     def __init__(self):
         # Initialize LLM
         self.llm = ChatGroq(
@@ -176,62 +419,60 @@ class TaskAgent:
         )
         
         # Initialize tools
-        self.task_tool = TaskManagerTool()
+        self.task_tool = _TASK_TOOL
         self.tools = [self.task_tool]
         
         # Build LangGraph workflow
         self.workflow = self._build_workflow()
         
-    def _build_workflow(self) -> StateGraph:
-        """Build the LangGraph workflow for task management"""
-        
-        def parse_command_node(state: AgentState) -> AgentState:
-            """Parse user command to extract task action and data"""
-            try:
-                user_input = state['user_input']
-                
-                # Determine action
-                action, task_data = self._parse_task_command(user_input)
-                
-                state['parsed_command'] = task_data
-                state['action'] = action
-                state['task_data'] = task_data
-                state['error'] = None
-                
-            except Exception as e:
-                state['error'] = f"Failed to parse task command: {str(e)}"
-                state['parsed_command'] = {}
-                state['action'] = ""
-                
-            return state
-        
-        def execute_task_action_node(state: AgentState) -> AgentState:
-            """Execute task management action"""
-            try:
-                if state.get('error'):
-                    return state
-                
-                action = state.get('action', '')
-                task_data = state.get('task_data', {})
-                
-                # Execute action
-                result = self.task_tool._run(action, task_data)
-                
-                state['response_message'] = f"✅ {result}"
-                state['error'] = None
-                
-            except Exception as e:
-                state['error'] = f"Failed to execute task action: {str(e)}"
-                state['response_message'] = "❌ Task action failed"
-                
-            return state
-        
-        # Build workflow graph
+    @staticmethod
+    def _parse_command_node(state: AgentState) -> Dict[str, Any]:
+        """Parse user command to extract task action and data"""
+        try:
+            # Determine action
+            action, task_data = TaskAgent._parse_task_command(state.user_input)
+            
+            return {
+                "parsed_command": task_data,
+                "action": action,
+                "task_data": task_data,
+                "error": None
+            }
+            
+        except Exception as e:
+            return {
+                "error": f"Failed to parse task command: {str(e)}",
+                "parsed_command": {},
+                "action": ""
+            }
+    
+    @staticmethod
+    def _execute_task_action_node(state: AgentState) -> Dict[str, Any]:
+        """Execute task management action"""
+        try:
+            if state.error:
+                return {}
+            
+            # Execute action
+            result = _execute(state.action, state.task_data or {})
+            
+            return {"response_message": f"✅ {result}", "error": None}
+            
+        except Exception as e:
+            return {
+                "error": f"Failed to execute task action: {str(e)}",
+                "response_message": "❌ Task action failed"
+            }
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _build_workflow() -> StateGraph:
+        """Build the LangGraph workflow for task management (compiled once per process)"""
         workflow = StateGraph(AgentState)
         
         # Add nodes
-        workflow.add_node("parse_command", parse_command_node)
-        workflow.add_node("execute_action", execute_task_action_node)
+        workflow.add_node("parse_command", TaskAgent._parse_command_node)
+        workflow.add_node("execute_action", TaskAgent._execute_task_action_node)
         
         # Add edges
         workflow.set_entry_point("parse_command")
@@ -240,34 +481,35 @@ class TaskAgent:
         
         return workflow.compile()
     
-    def _parse_task_command(self, text: str) -> tuple:
+    @classmethod
+    def _parse_task_command(cls, text: str) -> tuple:
         """Parse task command to determine action and data"""
         text_lower = text.lower()
         
         # Detect action
-        if any(keyword in text_lower for keyword in ["add", "create", "new", "remind me"]):
+        if cls._ADD_RE.search(text_lower):
             action = "add"
             task_data = {
-                "title": self._extract_task_title(text),
+                "title": cls._extract_task_title(text_lower),
                 "description": text,
-                "due_date": self._extract_due_date(text),
-                "priority": self._extract_priority(text)
+                "due_date": cls._extract_due_date(text_lower),
+                "priority": cls._extract_priority(text_lower)
             }
-        elif any(keyword in text_lower for keyword in ["list", "show", "what are", "my tasks"]):
+        elif cls._LIST_RE.search(text_lower):
             action = "list"
             task_data = {
                 "show_completed": "all" in text_lower or "completed" in text_lower,
-                "priority": self._extract_priority(text) if "high" in text_lower or "low" in text_lower else None
+                "priority": cls._extract_priority(text_lower) if "high" in text_lower or "low" in text_lower else None
             }
-        elif any(keyword in text_lower for keyword in ["complete", "done", "finish", "mark"]):
+        elif cls._COMPLETE_RE.search(text_lower):
             action = "complete"
             task_data = {
-                "title": self._extract_task_title(text)
+                "title": cls._extract_task_title(text_lower)
             }
-        elif any(keyword in text_lower for keyword in ["delete", "remove", "cancel"]):
+        elif cls._DELETE_RE.search(text_lower):
             action = "delete"
             task_data = {
-                "title": self._extract_task_title(text)
+                "title": cls._extract_task_title(text_lower)
             }
         else:
             action = "list"
@@ -275,21 +517,15 @@ class TaskAgent:
         
         return (action, task_data)
     
-    def _extract_task_title(self, text: str) -> str:
-        """Extract task title from text"""
-        import re
-        
+    @staticmethod
+    def _extract_task_title(text_lower: str) -> str:
+        """Extract task title from lowercased text"""
         # Remove action keywords
-        cleaned = text
-        for keyword in ["add task", "create task", "new task", "remind me to", "complete", "delete", "remove"]:
-            cleaned = cleaned.lower().replace(keyword, "")
-        
-        return cleaned.strip()
+        return _TASK_KEYWORDS_RE.sub("", text_lower).strip()
     
-    def _extract_due_date(self, text: str) -> Optional[str]:
-        """Extract due date from text"""
-        text_lower = text.lower()
-        
+    @staticmethod
+    def _extract_due_date(text_lower: str) -> Optional[str]:
+        """Extract due date from lowercased text"""
         if "tomorrow" in text_lower:
             return (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
         elif "today" in text_lower:
@@ -299,38 +535,39 @@ class TaskAgent:
         
         return None
     
-    def _extract_priority(self, text: str) -> str:
-        """Extract priority from text"""
-        text_lower = text.lower()
-        
-        if "high" in text_lower or "urgent" in text_lower or "important" in text_lower:
+    @staticmethod
+    def _extract_priority(text_lower: str) -> str:
+        """Extract priority from lowercased text"""
+        if _HIGH_PRIORITY_RE.search(text_lower):
             return "high"
         elif "low" in text_lower:
             return "low"
         
         return "medium"
     
+    @staticmethod
+    def _format_result(state: AgentState) -> Dict[str, Any]:
+        """Shape the final workflow state into the agent response"""
+        return {
+            "success": state.error is None,
+            "message": state.response_message,
+            "action": state.action,
+            "details": state.parsed_command
+        }
+    
+    def process_command_fast(self, user_input: str) -> AgentState:
+        """Run parse -> execute inline, without the StateGraph scheduler"""
+        state = AgentState(user_input=user_input)
+        _apply_update(state, self._parse_command_node(state))
+        _apply_update(state, self._execute_task_action_node(state))
+        return state
+    
     def process_command(self, user_input: str) -> Dict[str, Any]:
         """Process task command and return result"""
         try:
-            initial_state = {
-                "user_input": user_input,
-                "parsed_command": {},
-                "action": "",
-                "task_data": None,
-                "response_message": "",
-                "error": None
-            }
-            
-            # Run workflow
-            final_state = self.workflow.invoke(initial_state)
-            
-            return {
-                "success": final_state.get('error') is None,
-                "message": final_state.get('response_message', 'Task processed'),
-                "action": final_state.get('action', ''),
-                "details": final_state.get('parsed_command', {})
-            }
+            # The graph is a fixed two-node chain, so run it inline;
+            # self.workflow is kept for introspection and future branching
+            return self._format_result(self.process_command_fast(user_input))
             
         except Exception as e:
             return {
@@ -339,6 +576,10 @@ class TaskAgent:
                 "action": "",
                 "details": {}
             }
+    
+    async def aprocess_command(self, user_input: str) -> Dict[str, Any]:
+        """Process task command - tasks live in memory, so nothing here blocks"""
+        return self.process_command(user_input)
 
 # Create global instance
 task_agent = TaskAgent()
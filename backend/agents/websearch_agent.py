@@ -3,30 +3,49 @@ Web Search Agent for AI Task Automation Assistant
 Performs web searches and opens results in browser
 """
 
+import functools
+import threading
 import webbrowser
 import urllib.parse
 import re
-from typing import Dict, Any, Optional, TypedDict, ClassVar
+from typing import Dict, Any, Tuple, ClassVar
 from langchain.tools import BaseTool
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_groq import ChatGroq
-from langgraph.graph import StateGraph, END
 from pydantic import BaseModel, Field
 from config import config
 
+# Engine keywords in priority order; the highest-priority engine named
+# anywhere in the request wins
+_ENGINE_PRIORITY = (
+    ("youtube", ("youtube", "video", "videos")),
+    ("bing", ("bing",)),
+    ("duckduckgo", ("duckduckgo", "duck")),
+    ("scholar", ("scholar", "research", "paper", "papers")),
+    ("maps", ("maps", "directions", "location")),
+    ("images", ("image", "images", "picture", "pictures", "photo", "photos")),
+)
+_ENGINE_KEYWORDS: Dict[str, Tuple[int, str]] = {
+    keyword: (rank, engine)
+    for rank, (engine, keywords) in enumerate(_ENGINE_PRIORITY)
+    for keyword in keywords
+}
+_WORD_RE = re.compile(r"\w+")
+
+# Query extraction patterns, tried in order against the lowercased request
+_Q_PATTERNS = (
+    re.compile(r'(?:search|find|look up|google|bing)\s+(?:for\s+)?["\']?([^"\']+)["\']?'),
+    re.compile(r'(?:what|who|where|when|why|how)\s+(.+)'),
+)
+# Question openers whose remainder is taken as the query as-is
+_WH_PREFIXES = ("what ", "who ", "where ", "when ", "why ", "how ")
+# Search keywords stripped from the raw request when no pattern matches
+_STRIP_RE = re.compile(r'\b(?:search|find|look\s*up|google|bing|for)\b', re.IGNORECASE)
+
 class SearchRequest(BaseModel):
     """Web search request structure"""
     query: str
     engine: str = "google"  # google, bing, duckduckgo, youtube
 
-class AgentState(TypedDict):
-    """State for the Web Search agent workflow"""
-    user_input: str
-    parsed_command: Dict[str, Any]
-    search_url: str
-    response_message: str
-    error: Optional[str]
-
 class WebSearchTool(BaseTool):
     """Tool to perform web searches"""
     name: str = "web_search"
@@ -45,20 +64,15 @@ class WebSearchTool(BaseTool):
     def _run(self, query: str, engine: str = "google") -> str:
         """Perform web search"""
         try:
-            engine_lower = engine.lower()
-            
-            # Get search engine URL
-            if engine_lower in self.SEARCH_ENGINES:
-                base_url = self.SEARCH_ENGINES[engine_lower]
-            else:
-                base_url = self.SEARCH_ENGINES["google"]
+            # Get search engine URL, falling back to Google
+            base_url = self.SEARCH_ENGINES.get(engine.lower(), self.SEARCH_ENGINES["google"])
             
-            # Build search URL
-            encoded_query = urllib.parse.quote(query)
-            search_url = base_url + encoded_query
+            # Build search URL - spaces as '+', the form-encoding search engines expect
+            search_url = base_url + urllib.parse.quote_plus(query)
             
-            # Open in browser
-            webbrowser.open(search_url)
+            # Open in browser on a daemon thread - the OS handler (xdg-open,
+            # open, start) can take a while and the reply need not wait for it
+            threading.Thread(target=webbrowser.open, args=(search_url,), daemon=True).start()
             
             return f"Searching {engine} for: {query}"
             
@@ -66,150 +80,79 @@ class WebSearchTool(BaseTool):
             return f"Error performing search: {str(e)}"
 
 class WebSearchAgent:
-    """LangGraph-powered Web Search Agent"""
+    """Web Search Agent - parses the request and opens the search directly"""
     
     def __init__(self):
-        # Initialize LLM
-        self.llm = ChatGroq(
+        # Initialize tools
+        self.search_tool = WebSearchTool()
+        self.tools = [self.search_tool]
+        
+    @functools.cached_property
+    def llm(self):
+        """Groq client, built on first access - search parsing never needs it"""
+        from langchain_groq import ChatGroq
+        return ChatGroq(
             groq_api_key=config.GROQ_API_KEY,
             model_name=config.GROQ_MODEL,
             temperature=config.AGENT_TEMPERATURE,
             max_tokens=config.MAX_RESPONSE_TOKENS
         )
-        
-        # Initialize tools
-        self.search_tool = WebSearchTool()
-        self.tools = [self.search_tool]
-        
-        # Build LangGraph workflow
-        self.workflow = self._build_workflow()
-        
-    def _build_workflow(self) -> StateGraph:
-        """Build the LangGraph workflow for web search"""
-        
-        def parse_command_node(state: AgentState) -> AgentState:
-            """Parse user command to extract search query and engine"""
-            try:
-                user_input = state['user_input']
-                
-                # Extract search query and engine
-                query, engine = self._parse_search_request(user_input)
-                
-                state['parsed_command'] = {
-                    "query": query,
-                    "engine": engine
-                }
-                state['error'] = None
-                
-            except Exception as e:
-                state['error'] = f"Failed to parse search command: {str(e)}"
-                state['parsed_command'] = {}
-                
-            return state
-        
-        def perform_search_node(state: AgentState) -> AgentState:
-            """Perform web search"""
-            try:
-                if state.get('error'):
-                    return state
-                
-                parsed = state['parsed_command']
-                query = parsed.get('query', '')
-                engine = parsed.get('engine', 'google')
-                
-                if not query:
-                    state['error'] = "No search query provided"
-                    return state
-                
-                # Perform search
-                result = self.search_tool._run(query, engine)
-                
-                state['search_url'] = f"{engine}:{query}"
-                state['response_message'] = f"✅ {result}"
-                state['error'] = None
-                
-            except Exception as e:
-                state['error'] = f"Failed to perform search: {str(e)}"
-                state['response_message'] = "❌ Search failed"
-                
-            return state
-        
-        # Build workflow graph
-        workflow = StateGraph(AgentState)
-        
-        # Add nodes
-        workflow.add_node("parse_command", parse_command_node)
-        workflow.add_node("perform_search", perform_search_node)
-        
-        # Add edges
-        workflow.set_entry_point("parse_command")
-        workflow.add_edge("parse_command", "perform_search")
-        workflow.add_edge("perform_search", END)
-        
-        return workflow.compile()
     
     def _parse_search_request(self, text: str) -> tuple:
         """Parse search request to extract query and engine"""
         text_lower = text.lower()
         
-        # Detect search engine
+        # Detect search engine with one hash lookup per word
         engine = "google"
+        best_rank = len(_ENGINE_PRIORITY)
+        for word in _WORD_RE.findall(text_lower):
+            hit = _ENGINE_KEYWORDS.get(word)
+            if hit and hit[0] < best_rank:
+                best_rank, engine = hit
+                if best_rank == 0:
+                    break
         
-        if "youtube" in text_lower or "video" in text_lower:
-            engine = "youtube"
-        elif "bing" in text_lower:
-            engine = "bing"
-        elif "duckduckgo" in text_lower or "duck" in text_lower:
-            engine = "duckduckgo"
-        elif "scholar" in text_lower or "research" in text_lower or "paper" in text_lower:
-            engine = "scholar"
-        elif "maps" in text_lower or "directions" in text_lower or "location" in text_lower:
-            engine = "maps"
-        elif "image" in text_lower or "picture" in text_lower or "photo" in text_lower:
-            engine = "images"
-        
-        # Extract search query
-        query_patterns = [
-            r'(?:search|find|look up|google|bing)\s+(?:for\s+)?["\']?([^"\']+)["\']?',
-            r'(?:what|who|where|when|why|how)\s+(.+)',
-        ]
-        
+        # Extract search query - questions opening with a wh-word are the
+        # common case and need only a prefix check, not a regex scan
         query = ""
-        for pattern in query_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                query = match.group(1).strip()
-                break
+        if text_lower.startswith(_WH_PREFIXES):
+            query = text_lower[text_lower.find(' ') + 1:].strip()
+        else:
+            for pattern in _Q_PATTERNS:
+                match = pattern.search(text_lower)
+                if match:
+                    query = match.group(1).strip()
+                    break
         
-        # Fallback: use entire text if no pattern matched
+        # Fallback: use entire text minus common search keywords
         if not query:
-            # Remove common search keywords
-            query = text
-            for keyword in ["search", "find", "look up", "google", "bing", "for"]:
-                query = query.replace(keyword, "")
-            query = query.strip()
+            query = _STRIP_RE.sub("", text).strip()
         
         return (query, engine)
     
     def process_command(self, user_input: str) -> Dict[str, Any]:
         """Process search command and return result"""
         try:
-            initial_state = {
-                "user_input": user_input,
-                "parsed_command": {},
-                "search_url": "",
-                "response_message": "",
-                "error": None
-            }
+            # Parse -> search is a fixed linear flow, so run it directly
+            # rather than through a state graph
+            query, engine = self._parse_search_request(user_input)
+            details = {"query": query, "engine": engine}
+            
+            if not query:
+                return {
+                    "success": False,
+                    "message": "No search query provided",
+                    "search_url": "",
+                    "details": details
+                }
             
-            # Run workflow
-            final_state = self.workflow.invoke(initial_state)
+            result = self.search_tool._run(query, engine)
             
             return {
-                "success": final_state.get('error') is None,
-                "message": final_state.get('response_message', 'Search processed'),
-                "search_url": final_state.get('search_url', ''),
-                "details": final_state.get('parsed_command', {})
+                "success": True,
+                "message": f"✅ {result}",
+                "search_url": f"{engine}:{query}",
+                "details": details
             }
             
         except Exception as e:
@@ -3,9 +3,12 @@ WhatsApp Agent for AI Task Automation Assistant
 Uses LangGraph for stateful workflow management
 """
 
+import logging
 import re
+import sys
 import urllib.parse
-from typing import Dict, List, Any, Optional, TypedDict, ClassVar
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, TypedDict, ClassVar
 from langchain.tools import BaseTool
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_groq import ChatGroq
@@ -14,6 +17,103 @@ from langgraph.graph import StateGraph, END
 from pydantic import BaseModel, Field
 from config import config
 
+logger = logging.getLogger(__name__)
+
+# Command pattern, compiled once. One alternation covers all five phrasings:
+#   "Send WhatsApp message to [name] [message]"
+#   "[Send] WhatsApp to [name]: [message]"
+#   "[Send] WhatsApp [message] to [name] [message]"
+#   "[Send] message [name] [message]"
+#   "[Send] text [name] [message]"
+# The recipient is split from the message by a colon or by whitespace
+_WA_COMMAND_RE = re.compile(
+    r'(?:send\s+)?(?:whatsapp(?:\s+message)?\s+to|message|text)\s+(\w+)(?:\s*:\s*|\s+)(.+)',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Everything in a phone number that is not a digit or '+'
+_PHONE_STRIP_RE = re.compile(r'[^\d+]')
+
+# System prompts are constant, so their messages are built once at import
+_WA_SYSTEM_MSG = SystemMessage(content="""You are a command parser for WhatsApp messages. 
+Extract the recipient name and message from user input.
+
+Handle these patterns flexibly:
+- "Send WhatsApp to Jay: Hello how are you" -> recipient: "Jay", message: "Hello how are you"
+- "Message Vijay on WhatsApp: Meeting at 5 pm" -> recipient: "Vijay", message: "Meeting at 5 pm"
+- "WhatsApp Mom: I'll be late" -> recipient: "Mom", message: "I'll be late"
+- "WhatsApp to Jay hello" -> recipient: "Jay", message: "hello"
+- "Send WhatsApp to Sarah good morning" -> recipient: "Sarah", message: "good morning"
+- "Message John hi there" -> recipient: "John", message: "hi there"
+- "text Mom I'm coming home" -> recipient: "Mom", message: "I'm coming home"
+
+Be flexible with:
+- Different word orders
+- Missing punctuation (colons, commas)
+- Natural language patterns
+- Implicit "send" or "message" verbs
+
+Return ONLY in this format:
+RECIPIENT: [name]
+MESSAGE: [message content]
+
+If you cannot parse, return:
+ERROR: Unable to parse command""")
+
+_WA_GRAMMAR_MSG = SystemMessage(content="""You are a grammar correction assistant. Your job is to improve the grammar, capitalization, and punctuation of messages while keeping the original meaning and tone.
+
+Rules:
+1. Capitalize the first letter of the sentence
+2. Add proper punctuation at the end (. ? !)
+3. Fix any obvious grammar mistakes
+4. Keep the message natural and conversational
+5. Don't change the meaning or add extra words
+6. Keep informal language if it's intentional (like "gonna", "wanna")
+7. If the message is already perfect, return it as-is
+8. If the message is in Hindi, Hinglish, or any non-English language, return it EXACTLY as-is - do NOT translate or modify it
+9. For mixed language messages (like Hinglish), preserve the original language mix
+10. PRESERVE all line breaks (\\n) and numbered list formatting EXACTLY - do NOT merge numbered items into a single paragraph
+11. If the message contains a numbered list (1. 2. 3. etc.), keep each item on its own line
+
+Examples:
+- "how are you" -> "How are you?"
+- "i am coming home" -> "I am coming home."
+- "meeting at 5" -> "Meeting at 5."
+- "can we talk" -> "Can we talk?"
+- "thanks for the help" -> "Thanks for the help!"
+- "where are you" -> "Where are you?"
+- "aaj ka khana mat banaen" -> "aaj ka khana mat banaen"
+- "kal mat aana" -> "kal mat aana"
+- "kya haal hai bhai" -> "kya haal hai bhai"
+- "Here are some jokes!\\n1. Why did the chicken cross the road? To get to the other side!\\n2. knock knock" -> Keep EXACTLY as-is with line breaks intact
+
+Return ONLY the corrected message, nothing else.""")
+
+# Mock contact database, read-only. Keys are casefolded and interned once at
+# import so lookups only normalize the query
+_CONTACTS = MappingProxyType({sys.intern(k.casefold()): v for k, v in {
+    "jay": "+919321781905",
+    "jay sharma": "+919321781905",
+    "principal sir":"+919702011319",
+    "vijay": "+919876543211",
+    "vijay sharma": "+919876543211", 
+    "mom": "+919876543212",
+    "dad": "+919876543213",
+    "john": "+919876543214",
+    "alice": "+919876543215",
+    "boss": "+919876543216",
+    "shivam": "+918928013540",
+    "shivam patel": "+918928013540",
+    "shivam clg": "+918928013540",
+    "shivam college": "+918928013540",
+    "karthikeya": "+919876543218",
+    "gitanjali": "+919876543219",
+    "gitanjali mam": "+919876543219",
+    "shashank":"+917977305279",
+    "shivam 2":"+918928013540",
+    "vijay":"+919321781905"
+}.items()})
+
 class WhatsAppMessage(BaseModel):
     """WhatsApp message structure"""
     recipient: str
@@ -35,32 +135,11 @@ class ContactSearchTool(BaseTool):
     description: str = "Search for contact information given a name (supports partial matches)"
     
     # Mock contact database - in real implementation, this would connect to actual contacts
-    mock_contacts: ClassVar[Dict[str, str]] = {
-        "jay": "+919321781905",
-        "jay sharma": "+919321781905",
-        "principal sir":"+919702011319",
-        "vijay": "+919876543211",
-        "vijay sharma": "+919876543211", 
-        "mom": "+919876543212",
-        "dad": "+919876543213",
-        "john": "+919876543214",
-        "alice": "+919876543215",
-        "boss": "+919876543216",
-        "shivam": "+918928013540",
-        "shivam patel": "+918928013540",
-        "shivam clg": "+918928013540",
-        "shivam college": "+918928013540",
-        "karthikeya": "+919876543218",
-        "gitanjali": "+919876543219",
-        "gitanjali mam": "+919876543219",
-        "shashank":"+917977305279",
-        "shivam 2":"+918928013540",
-        "vijay":"+919321781905"
-    }
+    mock_contacts: ClassVar[Mapping[str, str]] = _CONTACTS
     
     def _fuzzy_match(self, search_name: str) -> Optional[str]:
         """Find best matching contact using fuzzy logic"""
-        search_lower = search_name.lower().strip()
+        search_lower = search_name.strip().casefold()
         
         # Remove common suffixes/prefixes
         search_clean = search_lower
@@ -91,12 +170,9 @@ class ContactSearchTool(BaseTool):
         
         return None
     
-    def _run(self, contact_name: str) -> str:
-        """Search for contact by name with fuzzy matching"""
-        phone = self._fuzzy_match(contact_name)
-        if phone:
-            return phone
-        return f"Contact '{contact_name}' not found"
+    def _run(self, contact_name: str) -> Optional[str]:
+        """Search for contact by name with fuzzy matching, None if not found"""
+        return self._fuzzy_match(contact_name)
 
 class WhatsAppURLTool(BaseTool):
     """Tool to generate WhatsApp wa.me URLs"""
@@ -105,8 +181,12 @@ class WhatsAppURLTool(BaseTool):
     
     def _run(self, phone_number: str, message: str) -> str:
         """Generate WhatsApp URL"""
-        # Clean phone number (remove spaces, dashes, etc.)
-        clean_phone = re.sub(r'[^\d+]', '', phone_number)
+        # Clean phone number (remove spaces, dashes, etc.) - contact numbers
+        # are usually stored clean already, so skip the copy for those
+        if phone_number.isascii() and phone_number.lstrip('+').isdigit():
+            clean_phone = phone_number
+        else:
+            clean_phone = _PHONE_STRIP_RE.sub('', phone_number)
         
         # URL encode the message
         encoded_message = urllib.parse.quote(message)
@@ -151,47 +231,13 @@ class WhatsAppAgent:
                 user_input = state['user_input'].strip()
                 
                 # First try regex-based parsing for common patterns
-                import re
-                
-                # Pattern 1: "[Send] WhatsApp [message] to [name] [rest of message]"
-                pattern1 = r'(?:send\s+)?whatsapp\s+(?:message\s+)?to\s+(\w+)\s+(.+)'
-                match1 = re.search(pattern1, user_input, re.IGNORECASE | re.DOTALL)
-                
-                # Pattern 2: "[Send] WhatsApp to [name]: [message]"
-                pattern2 = r'(?:send\s+)?whatsapp\s+to\s+(\w+)\s*:\s*(.+)'
-                match2 = re.search(pattern2, user_input, re.IGNORECASE | re.DOTALL)
-                
-                # Pattern 3: "Send WhatsApp message to [name] [message]" (more specific)
-                pattern3 = r'send\s+whatsapp\s+message\s+to\s+(\w+)\s+(.+)'
-                match3 = re.search(pattern3, user_input, re.IGNORECASE | re.DOTALL)
-                
-                # Pattern 4: "Message [name] [message]"
-                pattern4 = r'(?:send\s+)?message\s+(\w+)\s+(.+)'
-                match4 = re.search(pattern4, user_input, re.IGNORECASE | re.DOTALL)
-                
-                # Pattern 5: "Text [name] [message]"
-                pattern5 = r'(?:send\s+)?text\s+(\w+)\s+(.+)'
-                match5 = re.search(pattern5, user_input, re.IGNORECASE | re.DOTALL)
-                
                 recipient = None
                 message = None
                 
-                # Check patterns in order of specificity
-                if match3:  # Most specific first
-                    recipient, message = match3.groups()
-                    print(f"[DEBUG] Pattern 3 match: {recipient} -> {message}")
-                elif match2:
-                    recipient, message = match2.groups()
-                    print(f"[DEBUG] Pattern 2 match: {recipient} -> {message}")
-                elif match1:
-                    recipient, message = match1.groups()
-                    print(f"[DEBUG] Pattern 1 match: {recipient} -> {message}")
-                elif match4:
-                    recipient, message = match4.groups()
-                    print(f"[DEBUG] Pattern 4 match: {recipient} -> {message}")
-                elif match5:
-                    recipient, message = match5.groups()
-                    print(f"[DEBUG] Pattern 5 match: {recipient} -> {message}")
+                match = _WA_COMMAND_RE.search(user_input)
+                if match:
+                    recipient, message = match.groups()
+                    logger.debug("Pattern match: %s -> %s", recipient, message)
                 
                 if recipient and message:
                     # Clean the message - remove quotes and filler words
@@ -230,59 +276,23 @@ class WhatsAppAgent:
                         "recipient": recipient.strip(),
                         "message": message_clean
                     }
-                    print(f"[DEBUG] Regex parsing success: {recipient} -> {message_clean[:100]}...")
+                    logger.debug("Regex parsing success: %s -> %.100s...", recipient, message_clean)
                     return state
                 
-                print(f"[DEBUG] Regex parsing failed, trying LLM parsing...")
+                logger.debug("Regex parsing failed, trying LLM parsing...")
                 
                 # Fallback to LLM parsing
-                system_prompt = """You are a command parser for WhatsApp messages. 
-                Extract the recipient name and message from user input.
-                
-                Handle these patterns flexibly:
-                - "Send WhatsApp to Jay: Hello how are you" -> recipient: "Jay", message: "Hello how are you"
-                - "Message Vijay on WhatsApp: Meeting at 5 pm" -> recipient: "Vijay", message: "Meeting at 5 pm"
-                - "WhatsApp Mom: I'll be late" -> recipient: "Mom", message: "I'll be late"
-                - "WhatsApp to Jay hello" -> recipient: "Jay", message: "hello"
-                - "Send WhatsApp to Sarah good morning" -> recipient: "Sarah", message: "good morning"
-                - "Message John hi there" -> recipient: "John", message: "hi there"
-                - "text Mom I'm coming home" -> recipient: "Mom", message: "I'm coming home"
-                
-                Be flexible with:
-                - Different word orders
-                - Missing punctuation (colons, commas)
-                - Natural language patterns
-                - Implicit "send" or "message" verbs
-                
-                Return ONLY in this format:
-                RECIPIENT: [name]
-                MESSAGE: [message content]
-                
-                If you cannot parse, return:
-                ERROR: Unable to parse command"""
-                
-                messages = [
-                    SystemMessage(content=system_prompt),
-                    HumanMessage(content=user_input)
-                ]
-                
-                response = self.llm.invoke(messages)
+                response = self.llm.invoke([_WA_SYSTEM_MSG, HumanMessage(content=user_input)])
                 response_text = response.content.strip()
                 
                 if "ERROR:" in response_text:
                     state['error'] = f"Could not understand the WhatsApp command. Please try formats like: 'WhatsApp to [name] [message]' or 'Send WhatsApp to [name]: [message]'"
                     return state
                 
-                # Parse the response
-                lines = response_text.split('\n')
-                recipient = ""
-                message = ""
-                
-                for line in lines:
-                    if line.startswith("RECIPIENT:"):
-                        recipient = line.replace("RECIPIENT:", "").strip()
-                    elif line.startswith("MESSAGE:"):
-                        message = line.replace("MESSAGE:", "").strip()
+                # Parse the response - the recipient is the rest of its line,
+                # the message runs to the end so multi-line messages survive
+                recipient = response_text.partition("RECIPIENT:")[2].partition("\n")[0].strip()
+                message = response_text.partition("MESSAGE:")[2].strip()
                 
                 if not recipient or not message:
                     state['error'] = f"Could not extract recipient and message. Please try formats like: 'WhatsApp to [name] [message]' or 'Send WhatsApp to [name]: [message]'"
@@ -325,7 +335,7 @@ class WhatsAppAgent:
                     "message": message_clean
                 }
                 
-                print(f"[DEBUG] LLM parsing success: {recipient} -> {message_clean}")
+                logger.debug("LLM parsing success: %s -> %s", recipient, message_clean)
                 return state
                 
             except Exception as e:
@@ -344,41 +354,10 @@ class WhatsAppAgent:
                     return state
                 
                 # Use LLM to improve grammar
-                system_prompt = """You are a grammar correction assistant. Your job is to improve the grammar, capitalization, and punctuation of messages while keeping the original meaning and tone.
-                
-                Rules:
-                1. Capitalize the first letter of the sentence
-                2. Add proper punctuation at the end (. ? !)
-                3. Fix any obvious grammar mistakes
-                4. Keep the message natural and conversational
-                5. Don't change the meaning or add extra words
-                6. Keep informal language if it's intentional (like "gonna", "wanna")
-                7. If the message is already perfect, return it as-is
-                8. If the message is in Hindi, Hinglish, or any non-English language, return it EXACTLY as-is - do NOT translate or modify it
-                9. For mixed language messages (like Hinglish), preserve the original language mix
-                10. PRESERVE all line breaks (\\n) and numbered list formatting EXACTLY - do NOT merge numbered items into a single paragraph
-                11. If the message contains a numbered list (1. 2. 3. etc.), keep each item on its own line
-                
-                Examples:
-                - "how are you" -> "How are you?"
-                - "i am coming home" -> "I am coming home."
-                - "meeting at 5" -> "Meeting at 5."
-                - "can we talk" -> "Can we talk?"
-                - "thanks for the help" -> "Thanks for the help!"
-                - "where are you" -> "Where are you?"
-                - "aaj ka khana mat banaen" -> "aaj ka khana mat banaen"
-                - "kal mat aana" -> "kal mat aana"
-                - "kya haal hai bhai" -> "kya haal hai bhai"
-                - "Here are some jokes!\\n1. Why did the chicken cross the road? To get to the other side!\\n2. knock knock" -> Keep EXACTLY as-is with line breaks intact
-                
-                Return ONLY the corrected message, nothing else."""
-                
-                messages = [
-                    SystemMessage(content=system_prompt),
+                response = self.llm.invoke([
+                    _WA_GRAMMAR_MSG,
                     HumanMessage(content=f"Correct this message: {message}")
-                ]
-                
-                response = self.llm.invoke(messages)
+                ])
                 corrected_message = response.content.strip()
                 
                 # Remove any quotes that the LLM might have added
@@ -389,12 +368,12 @@ class WhatsAppAgent:
                 # Update the message in parsed_command
                 state['parsed_command']['message'] = corrected_message
                 
-                print(f"[DEBUG] Grammar correction: '{message}' -> '{corrected_message}'")
+                logger.debug("Grammar correction: '%s' -> '%s'", message, corrected_message)
                 return state
                 
             except Exception as e:
                 # If grammar correction fails, just continue with original message
-                print(f"[DEBUG] Grammar correction failed: {str(e)}")
+                logger.warning("Grammar correction failed: %s", e)
                 return state
         
         def search_contact_node(state: AgentState) -> AgentState:
@@ -406,7 +385,7 @@ class WhatsAppAgent:
                 recipient = state.get('parsed_command', {}).get("recipient", "")
                 phone_number = self.contact_tool._run(recipient)
                 
-                if "not found" in phone_number.lower():
+                if phone_number is None:
                     state['error'] = f"Contact '{recipient}' not found in your contacts. Please add the contact first."
                     return state
                 
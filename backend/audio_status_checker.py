@@ -5,12 +5,9 @@ Run this to check the status of all audio components
 
 import streamlit as st
 
-def check_audio_system_status():
-    """Check and display the status of all audio system components"""
-    
-    st.title("🔊 Audio System Status Checker")
-    st.write("This tool checks the status of all audio components in your AI assistant.")
-    
+@st.cache_data(ttl=300)
+def _probe() -> dict:
+    """Probe the audio components once; cached across Streamlit reruns"""
     status_report = {}
     
     # Check basic speech recognition
@@ -79,6 +76,16 @@ def check_audio_system_status():
     except Exception as e:
         status_report["Enhanced Speech Processor"] = f"⚠️ Error: {str(e)}"
     
+    return status_report
+
+def check_audio_system_status():
+    """Check and display the status of all audio system components"""
+    
+    st.title("🔊 Audio System Status Checker")
+    st.write("This tool checks the status of all audio components in your AI assistant.")
+    
+    status_report = _probe()
+    
     # Display results
     st.markdown("### 📊 System Status Report")
     
@@ -119,6 +126,4 @@ def check_audio_system_status():
     return status_report
 
 if __name__ == "__main__":
-    check_audio_system_status()
-else:
     check_audio_system_status()
\ No newline at end of file
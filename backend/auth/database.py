@@ -4,7 +4,8 @@ Simple in-memory database for users (for development)
 In production, use a real database like PostgreSQL, MongoDB, etc.
 """
 
-from typing import Dict, Optional
+from cachetools import TTLCache
+from typing import Dict, List, Optional
 from auth.models import User
 from datetime import datetime
 
@@ -12,40 +13,128 @@ class AuthDatabase:
     """Simple in-memory user database"""
     
     def __init__(self):
-        self.users: Dict[str, User] = {}
+        # Struct-of-arrays layout: one column per User field, row i is one user.
+        # Users are rebuilt on lookup instead of keeping a model per row
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.emails: List[str] = []
+        self.ages: List[int] = []
+        self.profile_pictures: List[Optional[str]] = []
+        self.created_at: List[datetime] = []
+        self.columns = {
+            "id": self.ids,
+            "name": self.names,
+            "email": self.emails,
+            "age": self.ages,
+            "profilePicture": self.profile_pictures,
+            "createdAt": self.created_at,
+        }
+        # User id -> row, lowercased email -> row. Both are unique: writes that
+        # would give two rows the same id or email raise ValueError
+        self.id_to_idx: Dict[str, int] = {}
+        self.email_to_idx: Dict[str, int] = {}
+        # Rebuilt (frozen) users, cache-aside by id and by lowercased email.
+        # Every write invalidates the affected user
+        self.by_id: TTLCache = TTLCache(maxsize=5000, ttl=60)
+        self.by_email: TTLCache = TTLCache(maxsize=5000, ttl=60)
+    
+    def invalidate(self, user_id: str, email: Optional[str] = None):
+        """Drop a user's cached lookups"""
+        self.by_id.pop(user_id, None)
+        if email is not None:
+            self.by_email.pop(email.lower(), None)
+    
+    def _row(self, idx: int) -> User:
+        """Rebuild the User stored at a row (already validated on create)"""
+        return User.model_construct(**{field: column[idx] for field, column in self.columns.items()})
     
     def create_user(self, user: User) -> User:
         """Create a new user"""
-        self.users[user.id] = user
+        idx = self.id_to_idx.get(user.id)
+        owner = self.email_to_idx.get(user.email.lower())
+        if owner is not None and owner != idx:
+            raise ValueError(f"Email already registered: {user.email}")
+        self.invalidate(user.id, user.email)
+        if idx is None:
+            idx = len(self.ids)
+            for field, column in self.columns.items():
+                column.append(getattr(user, field))
+            self.id_to_idx[user.id] = idx
+        else:
+            self.invalidate(user.id, self.emails[idx])
+            self.email_to_idx.pop(self.emails[idx].lower(), None)
+            for field, column in self.columns.items():
+                column[idx] = getattr(user, field)
+        self.email_to_idx[user.email.lower()] = idx
         return user
     
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
-        for user in self.users.values():
-            if user.email == email:
-                return user
-        return None
+        key = email.lower()
+        user = self.by_email.get(key)
+        if user is None:
+            idx = self.email_to_idx.get(key)
+            if idx is None:
+                return None
+            user = self.by_email[key] = self._row(idx)
+        return user
     
     def get_user_by_id(self, user_id: str) -> Optional[User]:
         """Get user by ID"""
-        return self.users.get(user_id)
+        user = self.by_id.get(user_id)
+        if user is None:
+            idx = self.id_to_idx.get(user_id)
+            if idx is None:
+                return None
+            user = self.by_id[user_id] = self._row(idx)
+        return user
     
     def update_user(self, user_id: str, update_data: dict) -> Optional[User]:
         """Update user information"""
-        user = self.users.get(user_id)
-        if user:
-            for key, value in update_data.items():
-                if hasattr(user, key):
-                    setattr(user, key, value)
-            return user
-        return None
+        idx = self.id_to_idx.get(user_id)
+        if idx is None:
+            return None
+        updates = {key: value for key, value in update_data.items() if key in self.columns}
+        
+        # Check the whole update before writing any column, so a rejected
+        # update leaves the row untouched
+        if "email" in updates:
+            owner = self.email_to_idx.get(updates["email"].lower())
+            if owner is not None and owner != idx:
+                raise ValueError(f"Email already registered: {updates['email']}")
+        if "id" in updates:
+            if updates["id"] in self.id_to_idx and updates["id"] != user_id:
+                raise ValueError(f"User id already exists: {updates['id']}")
+        
+        self.invalidate(user_id, self.emails[idx])
+        if "email" in updates:
+            self.email_to_idx.pop(self.emails[idx].lower(), None)
+            self.email_to_idx[updates["email"].lower()] = idx
+        if "id" in updates:
+            del self.id_to_idx[self.ids[idx]]
+            self.id_to_idx[updates["id"]] = idx
+        for key, value in updates.items():
+            self.columns[key][idx] = value
+        return self._row(idx)
     
     def delete_user(self, user_id: str) -> bool:
         """Delete a user"""
-        if user_id in self.users:
-            del self.users[user_id]
-            return True
-        return False
+        idx = self.id_to_idx.pop(user_id, None)
+        if idx is None:
+            return False
+        self.invalidate(user_id, self.emails[idx])
+        self.email_to_idx.pop(self.emails[idx].lower(), None)
+        
+        # Swap the last row into the hole so every column stays dense
+        last = len(self.ids) - 1
+        if idx != last:
+            for column in self.columns.values():
+                column[idx] = column[last]
+            self.id_to_idx[self.ids[idx]] = idx
+            self.email_to_idx[self.emails[idx].lower()] = idx
+        for column in self.columns.values():
+            column.pop()
+        return True
 
 # Global database instance
 auth_db = AuthDatabase()
@@ -2,12 +2,15 @@
 Authentication Models and Schemas
 """
 
-from pydantic import BaseModel, EmailStr
+from dataclasses import dataclass
+from pydantic import BaseModel, ConfigDict, EmailStr
 from typing import Optional
 from datetime import datetime
 
 class User(BaseModel):
-    """User model"""
+    """User model (immutable - change users through auth_db.update_user)"""
+    model_config = ConfigDict(frozen=True)
+    
     id: str
     name: str
     email: EmailStr
@@ -27,12 +30,14 @@ class UserLogin(BaseModel):
     email: EmailStr
     age: int
 
-class Token(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Token:
     """Token response schema"""
     access_token: str
     token_type: str = "bearer"
 
-class AuthResponse(BaseModel):
+@dataclass(slots=True, frozen=True)
+class AuthResponse:
     """Authentication response schema"""
     user: User
     token: str
@@ -3,17 +3,76 @@ Authentication Routes
 Login, Logout, and Google OAuth endpoints
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
-from fastapi.responses import RedirectResponse
+from fastapi import APIRouter, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from auth.models import UserLogin, AuthResponse, User
 from auth.utils import create_access_token, verify_token, generate_user_id
 from auth.database import auth_db
+from cachetools import TTLCache
 from datetime import datetime, timezone
+from typing import Dict
+import asyncio
+import hashlib
 import logging
+import os
+import threading
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/auth", tags=["Authentication"])
+# google-auth is optional - without it the Google endpoint answers 501
+try:
+    from google.oauth2 import id_token
+    from google.auth.transport import requests as google_requests
+    # One transport for the process: its requests.Session keeps the TLS
+    # connection to Google's cert endpoint alive between logins
+    _google_http = google_requests.Request()
+    GOOGLE_AUTH_AVAILABLE = True
+except ImportError:
+    GOOGLE_AUTH_AVAILABLE = False
+    logger.warning("google-auth not installed - Google OAuth login disabled")
+
+# Google Client ID, resolved once from the environment. Missing is not fatal:
+# /login keeps working, only the Google endpoint refuses requests
+GOOGLE_CLIENT_ID = os.getenv('GOOGLE_CLIENT_ID') or os.getenv('NEXT_PUBLIC_GOOGLE_CLIENT_ID')
+if GOOGLE_AUTH_AVAILABLE and not GOOGLE_CLIENT_ID:
+    logger.warning("GOOGLE_CLIENT_ID not set - Google OAuth login unavailable")
+
+# Verified Google ID tokens -> claims, keyed by a truncated SHA-256 digest
+_google_cache = TTLCache(maxsize=2000, ttl=60)
+_google_cache_lock = threading.Lock()
+# Verifications in progress, so concurrent logins with one token share a fetch
+_google_inflight: Dict[bytes, asyncio.Future] = {}
+
+def _verify_google_token(google_token: str, client_id: str, key: bytes) -> dict:
+    """Verify a Google ID token with Google's certs and cache its claims"""
+    idinfo = id_token.verify_oauth2_token(google_token, _google_http, client_id)
+    with _google_cache_lock:
+        _google_cache[key] = idinfo
+    return idinfo
+
+async def _verify_google_token_shared(google_token: str, client_id: str) -> dict:
+    """Verify a Google ID token, reusing recent or in-flight verifications"""
+    key = hashlib.sha256(f"{client_id}:{google_token}".encode()).digest()[:16]
+    with _google_cache_lock:
+        idinfo = _google_cache.get(key)
+    if idinfo is not None:
+        return idinfo
+    
+    task = _google_inflight.get(key)
+    if task is None:
+        # Off the event loop: verification makes a blocking HTTPS fetch of
+        # Google's signing certs
+        task = asyncio.ensure_future(
+            run_in_threadpool(_verify_google_token, google_token, client_id, key)
+        )
+        _google_inflight[key] = task
+        task.add_done_callback(lambda _: _google_inflight.pop(key, None))
+    # Shielded so one cancelled request does not cancel the others' wait
+    return await asyncio.shield(task)
+
+# Auth payloads are small and CPU-bound to encode; orjson does it in native code
+router = APIRouter(prefix="/api/auth", tags=["Authentication"], default_response_class=ORJSONResponse)
 
 @router.post("/login", response_model=AuthResponse)
 async def login(credentials: UserLogin):
@@ -27,11 +86,10 @@ async def login(credentials: UserLogin):
         if existing_user:
             # User exists, update info if needed
             if existing_user.name != credentials.name or existing_user.age != credentials.age:
-                auth_db.update_user(existing_user.id, {
+                existing_user = auth_db.update_user(existing_user.id, {
                     "name": credentials.name,
                     "age": credentials.age
-                })
-                existing_user = auth_db.get_user_by_id(existing_user.id)
+                }) or existing_user
 
             user = existing_user
         else:
@@ -51,7 +109,7 @@ async def login(credentials: UserLogin):
             data={"sub": user.id, "email": user.email}
         )
         
-        logger.info(f"✅ User logged in: {user.email}")
+        logger.info("✅ User logged in: %s", user.email)
         
         return AuthResponse(
             user=user,
@@ -59,7 +117,7 @@ async def login(credentials: UserLogin):
         )
     
     except Exception as e:
-        logger.error(f"❌ Login error: {str(e)}")
+        logger.error("❌ Login error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Login failed"
@@ -73,9 +131,12 @@ async def google_login(token: dict):
     Only accesses name and email from Google account
     """
     try:
-        from google.oauth2 import id_token
-        from google.auth.transport import requests
-        import os
+        if not GOOGLE_AUTH_AVAILABLE:
+            logger.error("❌ google-auth library not installed")
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail="Google OAuth requires google-auth library. Install: pip install google-auth"
+            )
         
         logger.info("🔐 Google OAuth login attempt started")
         
@@ -87,9 +148,7 @@ async def google_login(token: dict):
                 detail="Google token is required"
             )
         
-        # Get Google Client ID from environment
-        client_id = os.getenv('GOOGLE_CLIENT_ID') or os.getenv('NEXT_PUBLIC_GOOGLE_CLIENT_ID')
-        
+        client_id = GOOGLE_CLIENT_ID
         if not client_id:
             logger.error("❌ GOOGLE_CLIENT_ID not found in environment variables")
             raise HTTPException(
@@ -97,24 +156,20 @@ async def google_login(token: dict):
                 detail="Server configuration error: Google Client ID not set"
             )
         
-        logger.info(f"🔑 Using Client ID: {client_id[:20]}...")
+        logger.info("🔑 Using Client ID: %.20s...", client_id)
         
         try:
             # Verify token with Google (this validates the token and returns user info)
-            idinfo = id_token.verify_oauth2_token(
-                google_token, 
-                requests.Request(), 
-                client_id
-            )
+            idinfo = await _verify_google_token_shared(google_token, client_id)
             
-            logger.info(f"✅ Token verified successfully. User info: {list(idinfo.keys())}")
+            logger.info("✅ Token verified successfully. User info: %s", list(idinfo))
             
             # Extract ONLY name and email from token (as requested)
             email = idinfo.get('email')
             name = idinfo.get('name')
             picture = idinfo.get('picture')  # Optional: for profile picture
             
-            logger.info(f"📧 Email: {email}, 👤 Name: {name}")
+            logger.info("📧 Email: %s, 👤 Name: %s", email, name)
             
             if not email:
                 logger.error("❌ Email not found in Google token")
@@ -128,17 +183,16 @@ async def google_login(token: dict):
             existing_user = auth_db.get_user_by_email(email)
 
             if existing_user:
-                logger.info(f"👤 Existing user found: {existing_user.id}")
+                logger.info("👤 Existing user found: %s", existing_user.id)
                 # Update profile picture if available
                 if picture and existing_user.profilePicture != picture:
-                    auth_db.update_user(existing_user.id, {
+                    existing_user = auth_db.update_user(existing_user.id, {
                         "profilePicture": picture
-                    })
-                    existing_user = auth_db.get_user_by_id(existing_user.id)
+                    }) or existing_user
                 user = existing_user
             else:
                 # Create new user from Google account (name and email only)
-                logger.info(f"🆕 Creating new user for: {email}")
+                logger.info("🆕 Creating new user for: %s", email)
                 user_id = generate_user_id()
                 user = User(
                     id=user_id,
@@ -149,14 +203,14 @@ async def google_login(token: dict):
                     createdAt=datetime.now(timezone.utc)
                 )
                 auth_db.create_user(user)
-                logger.info(f"✅ New user created: {user.id}")
+                logger.info("✅ New user created: %s", user.id)
             
             # Generate JWT token
             access_token = create_access_token(
                 data={"sub": user.id, "email": user.email}
             )
             
-            logger.info(f"✅ User logged in via Google: {user.email}")
+            logger.info("✅ User logged in via Google: %s", user.email)
             
             return AuthResponse(
                 user=user,
@@ -165,25 +219,16 @@ async def google_login(token: dict):
             
         except ValueError as e:
             error_msg = str(e)
-            logger.error(f"❌ Token validation error: {error_msg}")
+            logger.error("❌ Token validation error: %s", error_msg)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail=f"Invalid Google token: {error_msg}"
             )
     
-    except ImportError as e:
-        logger.error(f"❌ google-auth library not installed: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_501_NOT_IMPLEMENTED,
-            detail="Google OAuth requires google-auth library. Install: pip install google-auth"
-        )
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        logger.error(f"❌ Google login error: {str(e)}")
-        logger.error(f"Traceback: {error_trace}")
+        logger.exception("❌ Google login error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Google login failed: {str(e)}"
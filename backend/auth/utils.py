@@ -3,27 +3,66 @@ Authentication Utilities
 JWT Token generation and validation
 """
 
+import hashlib
 import jwt
-from datetime import datetime, timedelta, timezone
+import os
+import tempfile
+import threading
+import time
+from cachetools import TTLCache
+from datetime import timedelta
+from pathlib import Path
 from typing import Optional
 import secrets
 
-# Secret key for JWT (in production, use environment variable)
-SECRET_KEY = secrets.token_urlsafe(32)
+def _load_or_create_secret(path: Path) -> str:
+    """Read the persisted JWT secret, creating it on first run"""
+    if not path.exists():
+        # Write the key to a private temp file, then hard-link it into place:
+        # the link appears with its contents already written, and fails if
+        # another worker linked its key first - then that key is used
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".jwt_secret.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(secrets.token_urlsafe(32))
+            try:
+                os.link(tmp, path)
+            except FileExistsError:
+                pass
+        finally:
+            os.unlink(tmp)
+    secret = path.read_text().strip()
+    if not secret:
+        raise RuntimeError(f"JWT secret file {path} is empty - delete it or set JWT_SECRET")
+    return secret
+
+# Secret key for JWT: JWT_SECRET from the environment, else a key persisted
+# next to the backend so tokens survive restarts and are shared by workers
+SECRET_KEY = os.getenv("JWT_SECRET") or _load_or_create_secret(
+    Path(__file__).resolve().parent.parent / ".jwt_secret"
+)
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 1 week
 
+# Recently verified tokens -> decoded payload. The short TTL bounds how long a
+# verified token skips signature checks; keys are truncated SHA-256 digests so
+# raw tokens are never held in memory
+TOKEN_CACHE_TTL_SECONDS = 10
+# Tokens issued here are a few hundred bytes; longer input is not ours
+MAX_TOKEN_LENGTH = 4096
+_token_cache = TTLCache(maxsize=10_000, ttl=TOKEN_CACHE_TTL_SECONDS)
+_token_cache_lock = threading.Lock()
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token
     """
-    to_encode = data.copy()
+    # exp as integer epoch seconds - what PyJWT would convert a datetime to
     if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
+        lifetime = int(expires_delta.total_seconds())
     else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    
-    to_encode.update({"exp": expire})
+        lifetime = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    to_encode = {**data, "exp": int(time.time()) + lifetime}
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -31,11 +70,25 @@ def verify_token(token: str) -> Optional[dict]:
     """
     Verify and decode JWT token
     """
+    # Structural gate: anything that is not header.payload.signature of sane
+    # size is rejected before hashing, base64 or HMAC work
+    if not token or len(token) > MAX_TOKEN_LENGTH or token.count(".") != 2:
+        return None
+    
+    key = hashlib.sha256(token.encode()).digest()[:16]
+    with _token_cache_lock:
+        payload = _token_cache.get(key)
+    if payload is not None and payload.get("exp", 0) > time.time():
+        return payload
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except Exception:
         return None
+    
+    with _token_cache_lock:
+        _token_cache[key] = payload
+    return payload
 
 def generate_user_id() -> str:
     """
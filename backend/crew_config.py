@@ -4,6 +4,8 @@ Simplified configuration for stable multi-agent workflows using Groq LLM exclusi
 """
 
 import os
+import re
+import threading
 from typing import Dict, Any, List, Optional
 from crewai import Agent, Task, Crew, Process
 from langchain_groq import ChatGroq
@@ -22,6 +24,26 @@ os.environ.pop("OPENAI_API_KEY", None)  # Remove OpenAI key if present to force
 # Set CrewAI to use our custom LLM configuration
 os.environ["GROQ_API_KEY"] = GROQ_API_KEY
 
+# Agent step-by-step output is synchronous stderr I/O on every reasoning
+# step; only turned on for debugging (DEBUG_MODE=true in .env)
+AGENT_VERBOSE = os.getenv("DEBUG_MODE", "false").lower() == "true"
+
+# Workflow types produced by analyze_command, one prebuilt crew each
+WORKFLOW_TYPES = ('file_and_share', 'file_only', 'whatsapp_only', 'general')
+
+# Keyword detection for analyze_command. Anchored at word starts only, so
+# inflections ("files", "sharing") still count but "context" is not "text"
+_SHARE_RE = re.compile(r"\b(?:send|share|whatsapp|wa\.me|message|text|chat)")
+_FILE_RE = re.compile(r"\b(?:file|document|doc|pdf|image|photo|video|folder|open|find|search)")
+
+# Task description per workflow type, filled with the user command
+_TASK_TEMPLATES = {
+    'file_and_share': "Help user with: {cmd}. Focus on file operations and WhatsApp sharing.",
+    'file_only': "Help user with file operations: {cmd}",
+    'whatsapp_only': "Help user with WhatsApp messaging: {cmd}",
+    'general': "Help user with: {cmd}",
+}
+
 class CrewAIOrchestrator:
     """Main orchestrator for multi-agent workflows using Groq LLM exclusively"""
     
@@ -29,7 +51,12 @@ class CrewAIOrchestrator:
         # Ensure clean environment for Groq-only usage
         self._configure_environment()
         self.llm = self._setup_llm()
-        self.agents = self._create_agents()
+        # Each workflow's crew is wired once, with its own agent instances -
+        # kickoff mutates agent state, so crews must not share agents.
+        # Only crew.tasks varies per request; the lock keeps concurrent
+        # requests of one type from swapping tasks under a running kickoff
+        self._crews = {task_type: self._build_crew(task_type) for task_type in WORKFLOW_TYPES}
+        self._crew_locks = {task_type: threading.Lock() for task_type in WORKFLOW_TYPES}
         
     def _configure_environment(self):
         """Configure environment to use Groq exclusively"""
@@ -63,7 +90,7 @@ class CrewAIOrchestrator:
             backstory="""You are an intelligent task coordinator who understands user intentions 
             and efficiently delegates tasks to specialized agents. You excel at breaking down 
             complex requests into actionable tasks and determining the best agent for each job.""",
-            verbose=True,
+            verbose=AGENT_VERBOSE,
             allow_delegation=True,
             llm=shared_llm,
             max_iter=3,
@@ -77,7 +104,7 @@ class CrewAIOrchestrator:
             backstory="""You are a file management expert who can efficiently search for files, 
             understand file locations, and prepare files for sharing. You have deep knowledge 
             of file systems and can find files even with partial names or descriptions.""",
-            verbose=True,
+            verbose=AGENT_VERBOSE,
             allow_delegation=False,
             llm=shared_llm,
             max_iter=2,
@@ -91,7 +118,7 @@ class CrewAIOrchestrator:
             backstory="""You are a communication expert specializing in WhatsApp messaging. 
             You can compose natural messages, understand contact relationships, and create 
             WhatsApp sharing links with proper formatting for different types of content.""",
-            verbose=True,
+            verbose=AGENT_VERBOSE,
             allow_delegation=False,
             llm=shared_llm,
             max_iter=2,
@@ -105,21 +132,28 @@ class CrewAIOrchestrator:
         }
     
     def create_crew_for_task(self, task_type: str) -> Crew:
+        """Return the prebuilt crew for a task type (general crew if unknown)"""
+        return self._crews.get(task_type) or self._crews['general']
+    
+    def _build_crew(self, task_type: str) -> Crew:
         """Create appropriate crew based on task type with Groq LLM"""
         
+        # Fresh agents for this crew only
+        crew_agents = self._create_agents()
+        
         try:
             if task_type == 'file_and_share':
                 # Complex workflow: file search + WhatsApp sharing
-                agents = [self.agents['coordinator'], self.agents['file_manager'], self.agents['whatsapp_agent']]
+                agents = [crew_agents['coordinator'], crew_agents['file_manager'], crew_agents['whatsapp_agent']]
             elif task_type == 'file_only':
                 # Simple file operations
-                agents = [self.agents['coordinator'], self.agents['file_manager']]
+                agents = [crew_agents['coordinator'], crew_agents['file_manager']]
             elif task_type == 'whatsapp_only':
                 # Simple messaging
-                agents = [self.agents['coordinator'], self.agents['whatsapp_agent']]
+                agents = [crew_agents['coordinator'], crew_agents['whatsapp_agent']]
             else:
                 # General crew with all agents
-                agents = list(self.agents.values())
+                agents = list(crew_agents.values())
             
             # Create crew with explicit Groq configuration
             return Crew(
@@ -133,7 +167,7 @@ class CrewAIOrchestrator:
         except Exception as e:
             # Fallback to simple crew if advanced features fail
             return Crew(
-                agents=[self.agents['coordinator']],
+                agents=[crew_agents['coordinator']],
                 process=Process.sequential,
                 verbose=False,
                 memory=False,
@@ -145,18 +179,8 @@ class CrewAIOrchestrator:
         command_lower = user_command.lower()
         
         # Detect file + WhatsApp sharing patterns
-        sharing_patterns = [
-            'send', 'share', 'whatsapp', 'wa.me',
-            'message', 'text', 'chat'
-        ]
-        
-        file_patterns = [
-            'file', 'document', 'doc', 'pdf', 'image', 'photo',
-            'video', 'folder', 'open', 'find', 'search'
-        ]
-        
-        has_sharing = any(pattern in command_lower for pattern in sharing_patterns)
-        has_file = any(pattern in command_lower for pattern in file_patterns)
+        has_sharing = _SHARE_RE.search(command_lower) is not None
+        has_file = _FILE_RE.search(command_lower) is not None
         
         if has_file and has_sharing:
             return {
@@ -195,14 +219,7 @@ class CrewAIOrchestrator:
                 crew = self.create_crew_for_task(workflow_type)
                 
                 # Create simpler task descriptions to avoid complex processing
-                if workflow_type == 'file_and_share':
-                    task_description = f"Help user with: {user_command}. Focus on file operations and WhatsApp sharing."
-                elif workflow_type == 'file_only':
-                    task_description = f"Help user with file operations: {user_command}"
-                elif workflow_type == 'whatsapp_only':
-                    task_description = f"Help user with WhatsApp messaging: {user_command}"
-                else:
-                    task_description = f"Help user with: {user_command}"
+                task_description = _TASK_TEMPLATES.get(workflow_type, _TASK_TEMPLATES['general']).format(cmd=user_command)
                 
                 # Create and execute task with timeout
                 task = Task(
@@ -211,8 +228,9 @@ class CrewAIOrchestrator:
                     expected_output="Brief, helpful response with actionable information"
                 )
                 
-                crew.tasks = [task]
-                result = crew.kickoff()
+                with self._crew_locks.get(workflow_type, self._crew_locks['general']):
+                    crew.tasks = [task]
+                    result = crew.kickoff()
                 
                 return {
                     'success': True,
@@ -6,31 +6,43 @@ Enhanced with Real Functionality: Voice Recognition, File Access, and Agent Coor
 import os
 import logging
 import json
-import glob
+import re
 import platform
 import subprocess
 import asyncio
+import heapq
+import threading
 from datetime import datetime
+from operator import itemgetter
 from typing import Dict, Any, List, Optional, Set
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, File, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
+from cachetools import TTLCache
 import uvicorn
 
-# JSON serialization helper function
-def json_serializable(obj):
-    """Convert objects to JSON serializable format"""
+# orjson encodes responses several times faster than stdlib json - optional
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _json_default(obj):
+    """Encode what JSON has no type for: datetimes and plain objects"""
     if isinstance(obj, datetime):
         return obj.isoformat()
-    elif isinstance(obj, dict):
-        return {k: json_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [json_serializable(item) for item in obj]
-    elif hasattr(obj, '__dict__'):
-        return json_serializable(obj.__dict__)
-    else:
-        return obj
+    if hasattr(obj, '__dict__'):
+        return obj.__dict__
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def json_dumps(obj) -> str:
+    """Serialize a message to JSON text"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_json_default).decode()
+    return json.dumps(obj, default=_json_default)
 
 # Import real functionality from main.py components
 try:
@@ -120,75 +132,129 @@ class HealthResponse(BaseModel):
     speech_available: bool
     config_available: bool
 
+# WhatsApp links in CrewAI output
+_WA_URL_RE = re.compile(r'https://[^\s]+(?:wa\.me|whatsapp\.com)[^\s]*')
+
+# Host platform, resolved once; file opening binds to the platform's launcher.
+# Popen returns as soon as the launcher starts instead of waiting on it
+_SYSTEM = platform.system().lower()
+if _SYSTEM == "windows":
+    _open_with_default_app = os.startfile
+elif _SYSTEM == "darwin":  # macOS
+    def _open_with_default_app(path: str):
+        subprocess.Popen(["open", path])
+else:  # Linux
+    def _open_with_default_app(path: str):
+        subprocess.Popen(["xdg-open", path])
+
+# Directories that never hold user files worth finding - not descended into
+_PRUNE_DIRS = frozenset({
+    'node_modules', '__pycache__', 'venv', 'site-packages',
+    'dist', 'build', '$RECYCLE.BIN', 'System Volume Information'
+})
+
 # Enhanced File Manager with Real File System Access
 class EnhancedFileManager:
     """Enhanced file manager with real file system access"""
     
     def __init__(self):
         self.search_locations = self._get_search_locations()
+        # Recent results by (query, file types) - voice commands often repeat
+        # a search within seconds, and a walk costs far more than a lookup
+        self._search_cache = TTLCache(maxsize=64, ttl=30)
+        self._search_cache_lock = threading.Lock()
     
     def search_files(self, query: str, file_types: List[str] = None) -> List[Dict]:
         """Search for files with enhanced patterns and real file access"""
         try:
-            results = []
             query = query.lower().strip()
+            # Extensions normalized once, so 'PDF' and '.pdf' both mean pdf
+            file_types_set = frozenset(t.lower().lstrip('.') for t in file_types) if file_types else None
             
-            # Enhanced search patterns
-            patterns = [
-                f"*{query}*",
-                f"*{query}*.*",
-                f"{query}*",
-                f"*{query}"
-            ]
-            
-            # Add file type specific patterns
-            if file_types:
-                for file_type in file_types:
-                    patterns.extend([
-                        f"*{query}*.{file_type}",
-                        f"{query}*.{file_type}"
-                    ])
-            
-            for location in self.search_locations:
-                try:
-                    for pattern in patterns:
-                        matches = glob.glob(os.path.join(location, '**', pattern), recursive=True)
-                        
-                        for match in matches[:10]:  # Limit to 10 per location
-                            if os.path.isfile(match):
-                                file_info = {
-                                    'name': os.path.basename(match),
-                                    'path': match,
-                                    'size': os.path.getsize(match),
-                                    'modified': datetime.fromtimestamp(os.path.getmtime(match)).isoformat(),
-                                    'extension': os.path.splitext(match)[1],
-                                    'location': os.path.dirname(match)
-                                }
-                                
-                                # Avoid duplicates
-                                if not any(r['path'] == file_info['path'] for r in results):
-                                    results.append(file_info)
-                except Exception as e:
-                    logger.warning(f"Search error in {location}: {e}")
-                    continue
+            cache_key = (query, file_types_set)
+            with self._search_cache_lock:
+                cached = self._search_cache.get(cache_key)
+            if cached is not None:
+                return list(cached)
             
-            # Sort by relevance (name match first, then modified date)
-            results.sort(key=lambda x: (
-                not query in x['name'].lower(),
-                -os.path.getmtime(x['path'])
-            ))
+            # Top 15 by most recent modification - every result already contains
+            # the query. A bounded heap keeps only those 15 while matches stream in
+            top = heapq.nlargest(15, self._matches(query, file_types_set), key=itemgetter(0))
+            results = [file_info for _, file_info in top]
             
-            return results[:15]  # Return top 15 results
+            with self._search_cache_lock:
+                self._search_cache[cache_key] = tuple(results)
+            return results
             
         except Exception as e:
             logger.error(f"File search error: {e}")
             return []
     
+    def _matches(self, query: str, file_types_set: Optional[frozenset]):
+        """Yield (mtime, file info) for every file whose name contains the query"""
+        seen_paths = set()
+        for location in self.search_locations:
+            try:
+                found = 0
+                for entry in self._walk(location):
+                    name = entry.name.lower()
+                    if query not in name:
+                        continue
+                    extension = os.path.splitext(entry.name)[1]
+                    if file_types_set and extension[1:].lower() not in file_types_set:
+                        continue
+                    # Locations can nest (OneDrive/Documents); skip files already found
+                    if entry.path in seen_paths:
+                        continue
+                    seen_paths.add(entry.path)
+                    
+                    # One stat per match, reused for size and date
+                    stat = entry.stat()
+                    file_info = {
+                        'name': entry.name,
+                        'path': entry.path,
+                        'size': stat.st_size,
+                        'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                        'extension': extension,
+                        'location': os.path.dirname(entry.path)
+                    }
+                    yield stat.st_mtime, file_info
+                    
+                    found += 1
+                    if found >= 10:  # Limit to 10 per location
+                        break
+            except Exception as e:
+                logger.warning(f"Search error in {location}: {e}")
+                continue
+    
+    def _walk(self, location: str):
+        """Yield every file under a location, one scandir pass per directory"""
+        stack = [location]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        # Hidden entries (.git, .cache, .venv, ...) are skipped, as glob did
+                        if entry.name.startswith('.'):
+                            continue
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                # Pruned here, so their contents are never listed
+                                if entry.name not in _PRUNE_DIRS:
+                                    stack.append(entry.path)
+                            elif entry.is_file():
+                                yield entry
+                        except OSError:
+                            continue
+            except OSError:
+                # Unreadable directory - skip it, keep walking the rest
+                continue
+    
     def _get_search_locations(self) -> List[str]:
         """Get enhanced search locations based on platform"""
         locations = []
         
-        if platform.system().lower() == "windows":
+        if _SYSTEM == "windows":
             user_profile = os.environ.get('USERPROFILE', '')
             potential_locations = [
                 os.path.join(user_profile, 'Documents'),
@@ -223,14 +289,7 @@ class EnhancedFileManager:
             if not os.path.exists(file_path):
                 return {'success': False, 'error': 'File not found'}
             
-            system = platform.system().lower()
-            
-            if system == "windows":
-                os.startfile(file_path)
-            elif system == "darwin":  # macOS
-                subprocess.run(["open", file_path])
-            else:  # Linux
-                subprocess.run(["xdg-open", file_path])
+            _open_with_default_app(file_path)
             
             return {
                 'success': True,
@@ -268,6 +327,10 @@ class EnhancedFileManager:
         except Exception as e:
             return {'success': False, 'error': str(e)}
 
+def _trigrams(text: str) -> Set[str]:
+    """Every 3-character window of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
 # Enhanced WhatsApp Manager with Real Contact Management
 class EnhancedWhatsAppManager:
     """Enhanced WhatsApp manager with better contact handling and URL generation"""
@@ -286,6 +349,16 @@ class EnhancedWhatsAppManager:
             "wife": "+919876543218",
             "husband": "+919876543219"
         }
+        # Trigram -> contact names containing it, so fuzzy lookups only
+        # visit contacts that share text with the query
+        self._by_trigram: Dict[str, Set[str]] = {}
+        for name in self.contacts:
+            self._index_contact(name)
+    
+    def _index_contact(self, name: str):
+        """Add a contact name to the trigram index"""
+        for gram in _trigrams(name):
+            self._by_trigram.setdefault(gram, set()).add(name)
     
     def find_contact(self, contact_name: str) -> Optional[str]:
         """Find contact with fuzzy matching"""
@@ -295,9 +368,21 @@ class EnhancedWhatsAppManager:
         if contact_name in self.contacts:
             return self.contacts[contact_name]
         
-        # Fuzzy matching
+        # Fuzzy matching - candidates sharing the most trigrams with the query
+        # are tried first; a match must still contain, or be contained in, it
+        grams = _trigrams(contact_name)
+        if grams:
+            overlap: Dict[str, int] = {}
+            for gram in grams:
+                for name in self._by_trigram.get(gram, ()):
+                    overlap[name] = overlap.get(name, 0) + 1
+            for name in sorted(overlap, key=overlap.get, reverse=True):
+                if contact_name in name or name in contact_name:
+                    return self.contacts[name]
+        
+        # Names and queries under three characters have no trigrams to index
         for name, phone in self.contacts.items():
-            if contact_name in name or name in contact_name:
+            if (not grams or len(name) < 3) and (contact_name in name or name in contact_name):
                 return phone
         
         # Return default if no match
@@ -329,7 +414,9 @@ class EnhancedWhatsAppManager:
     def add_contact(self, name: str, phone: str) -> bool:
         """Add new contact to the database"""
         try:
-            self.contacts[name.lower()] = phone
+            name = name.lower()
+            self.contacts[name] = phone
+            self._index_contact(name)
             return True
         except Exception:
             return False
@@ -373,7 +460,8 @@ app = FastAPI(
     title="CrewAI Multi-Agent Backend with Enhanced Functionality", 
     description="Advanced AI assistant with voice recognition, file management, and CrewAI orchestration",
     version="3.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
 )
 
 # Enhanced CORS configuration
@@ -456,7 +544,8 @@ async def process_command(request: CommandRequest) -> CommandResponse:
         if AGENT_MANAGER_AVAILABLE and agent_manager:
             logger.info("🎯 Using real agent manager with conversational AI")
             
-            result = agent_manager.process_command(command)
+            # Agents block on LLM and network calls - keep them off the event loop
+            result = await asyncio.to_thread(agent_manager.process_command, command)
             
             # Enhanced logging
             logger.info(f"Real agent processed - Success: {result['success']}, Agent: {result['agent_used']}, Intent: {result['intent']}")
@@ -524,15 +613,16 @@ async def process_command(request: CommandRequest) -> CommandResponse:
         elif CREWAI_AVAILABLE and orchestrator:
             logger.info("🤖 Using CrewAI orchestration")
             
-            result = orchestrator.execute_workflow(command)
+            result = await asyncio.to_thread(orchestrator.execute_workflow, command)
             
             # Extract WhatsApp URL if present
             whatsapp_url = None
-            if "wa.me" in result.get('result', '') or "whatsapp.com" in result.get('result', ''):
-                import re
-                urls = re.findall(r'https://[^\s]+(?:wa\.me|whatsapp\.com)[^\s]*', result.get('result', ''))
-                if urls:
-                    whatsapp_url = urls[0]
+            result_text = result.get('result', '')
+            # Cheap substring test first - most results carry no link
+            if "wa.me" in result_text or "whatsapp.com" in result_text:
+                match = _WA_URL_RE.search(result_text)
+                if match:
+                    whatsapp_url = match.group()
             
             return CommandResponse(
                 success=result['success'],
@@ -599,7 +689,7 @@ async def process_enhanced_fallback(command: str) -> CommandResponse:
             file_query = "document"
         
         # Enhanced file search
-        files = file_manager.search_files(file_query, ['pdf', 'doc', 'docx', 'txt', 'jpg', 'png'])
+        files = await asyncio.to_thread(file_manager.search_files, file_query, ['pdf', 'doc', 'docx', 'txt', 'jpg', 'png'])
         
         if files:
             file_info = files[0]  # Take the best match
@@ -644,13 +734,13 @@ async def process_enhanced_fallback(command: str) -> CommandResponse:
         if not file_query.strip():
             file_query = "document"
         
-        files = file_manager.search_files(file_query)
+        files = await asyncio.to_thread(file_manager.search_files, file_query)
         
         if files:
             file_info = files[0]
             
             # Try to open the file
-            open_result = file_manager.open_file(file_info['path'])
+            open_result = await asyncio.to_thread(file_manager.open_file, file_info['path'])
             
             if open_result['success']:
                 return CommandResponse(
@@ -750,7 +840,8 @@ async def text_to_speech(request: TTSRequest):
         
         # Use enhanced speech processor if available
         if SPEECH_PROCESSOR_AVAILABLE and enhanced_speech_processor:
-            success = enhanced_speech_processor.text_to_speech_enhanced(
+            success = await asyncio.to_thread(
+                enhanced_speech_processor.text_to_speech_enhanced,
                 text=request.text,
                 language=request.language
             )
@@ -1033,18 +1124,14 @@ class WebSocketManager:
     
     async def send_message(self, websocket: WebSocket, message: dict):
         try:
-            # Convert message to JSON serializable format
-            serializable_message = json_serializable(message)
-            await websocket.send_text(json.dumps(serializable_message))
+            await websocket.send_text(json_dumps(message))
         except Exception as e:
             logger.error(f"❌ Error sending WebSocket message: {e}")
             self.disconnect(websocket)
     
     async def broadcast(self, message: dict):
         disconnected = set()
-        # Convert message to JSON serializable format
-        serializable_message = json_serializable(message)
-        message_text = json.dumps(serializable_message)
+        message_text = json_dumps(message)
         
         for connection in self.active_connections.copy():
             try: